@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""Medidas de construcción de ControlPanel sin pantalla física.
+
+Uso:
+    python3 benchmarks/bench_panel.py [--scales 1,10,100] [--repeat 5]
+        [--backend auto|display|xvfb|broadway] [--output resultados.json]
+        [--thresholds benchmarks/thresholds.json]
+
+Sin DISPLAY/WAYLAND_DISPLAY se arranca un servidor virtual (Xvfb o
+broadwayd). Las preferencias, cachés y registros se escriben en una carpeta
+temporal para no tocar los del usuario. El proceso termina con código 1 si
+alguna medida supera su umbral.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# Pantallas usadas por los servidores virtuales
+XVFB_DISPLAY = ":97"
+BROADWAY_DISPLAY = ":7"
+
+
+def start_display(backend):
+    """Preparar el backend de GDK antes de importar GTK; devuelve el proceso lanzado"""
+    if backend == "auto":
+        if os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"):
+            return None
+        backend = "xvfb" if shutil.which("Xvfb") else "broadway"
+    if backend == "display":
+        return None
+    if backend == "xvfb":
+        server = subprocess.Popen(["Xvfb", XVFB_DISPLAY, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["DISPLAY"] = XVFB_DISPLAY
+        os.environ["GDK_BACKEND"] = "x11"
+    else:
+        server = subprocess.Popen(["broadwayd", BROADWAY_DISPLAY],
+                                  stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        os.environ["BROADWAY_DISPLAY"] = BROADWAY_DISPLAY
+        os.environ["GDK_BACKEND"] = "broadway"
+    os.environ.pop("WAYLAND_DISPLAY", None)
+    # Dar tiempo al servidor a crear su socket
+    time.sleep(0.5)
+    return server
+
+
+def isolate_environment(directory):
+    for env, name in (("XDG_CONFIG_HOME", "config"), ("XDG_CACHE_HOME", "cache"),
+                      ("XDG_STATE_HOME", "state"), ("XDG_DATA_HOME", "data")):
+        os.environ[env] = os.path.join(directory, name)
+    # Sin herramientas descubiertas: solo se mide el catálogo sintético
+    os.environ.pop("CUERD_SETTINGS_DISCOVER", None)
+    os.environ.pop("CUERD_SETTINGS_TRACE", None)
+
+
+def rss_kib():
+    """RSS actual y máximo del proceso (VmRSS, VmHWM) en KiB"""
+    values = {}
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    key, value = line.split(":", 1)
+                    values[key] = int(value.split()[0])
+    except OSError:
+        pass
+    return values.get("VmRSS", 0), values.get("VmHWM", 0)
+
+
+def synthetic_catalog(base, factor):
+    """Catálogo con unas factor veces más entradas que base.
+
+    Crecen tanto el número de secciones como el de entradas por sección
+    (raíz cuadrada del factor cada uno); los iconos se reparten entre los
+    que usa el catálogo real para que también se midan las decodificaciones.
+    """
+    from cuerd_settings.catalog import Catalog
+
+    icons = sorted({entry["icon"] for entry in base.entries()})
+    target = max(1, round(sum(1 for _ in base.entries()) * factor))
+    copies = min(target, max(1, round(len(base.sections) * factor ** 0.5)))
+    sections = []
+    for index in range(copies):
+        template = base.sections[index % len(base.sections)]
+        section_id = f"{template['id']}-{index}"
+        count = target // copies + (1 if index < target % copies else 0)
+        entries = [{
+            "id": f"{section_id}-{number}",
+            "label": f"{template['title']} {number}",
+            "command": "true",
+            "icon": icons[(index + number) % len(icons)],
+            "session": None,
+            "section": section_id,
+        } for number in range(count)]
+        sections.append({**template, "id": section_id, "entries": entries})
+    return Catalog(base.locale, sections, dict(base.strings))
+
+
+def iterate_until(condition, timeout=10.0):
+    from gi.repository import Gtk
+
+    deadline = time.perf_counter() + timeout
+    while not condition() and time.perf_counter() < deadline:
+        Gtk.main_iteration_do(False)
+
+
+def measure_construction(app, catalog, repeat):
+    """Tiempo de ControlPanel(), del primer fotograma y memoria máxima"""
+    from gi.repository import Gtk
+
+    construct, first_draw, complete = [], [], []
+    tracemalloc.start()
+    for _ in range(repeat):
+        app.icon_cache.clear()
+        start = time.perf_counter()
+        panel = app.ControlPanel(catalog)
+        construct.append(time.perf_counter() - start)
+
+        drawn = []
+        panel.connect_after("draw", lambda *args: drawn.append(time.perf_counter()))
+        panel.show_all()
+        iterate_until(lambda: drawn)
+        if drawn:
+            first_draw.append(drawn[0] - start)
+        # Secciones pendientes construidas en segundo plano e iconos decodificados
+        iterate_until(lambda: not panel.pending_sections and not panel.icon_loader.busy())
+        complete.append(time.perf_counter() - start)
+        panel.destroy()
+        while Gtk.events_pending():
+            Gtk.main_iteration_do(False)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "construct_ms": statistics.median(construct) * 1000,
+        "first_draw_ms": statistics.median(first_draw) * 1000 if first_draw else None,
+        "all_sections_ms": statistics.median(complete) * 1000,
+        "tracemalloc_peak_kib": peak / 1024,
+    }
+
+
+def measure_crear_seccion(app, catalog):
+    """Coste medio de crear_seccion construyendo todas las secciones de inmediato"""
+    from gi.repository import Gtk
+
+    panel = app.ControlPanel(catalog)
+    panel.viewport_budget = float("inf")
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    entries = 0
+    start = time.perf_counter()
+    for seccion in catalog.sections:
+        panel.crear_seccion(box, seccion)
+        entries += len(seccion["entries"])
+    elapsed = time.perf_counter() - start
+    box.destroy()
+    panel.destroy()
+    return {
+        "crear_seccion_ms": elapsed * 1000 / len(catalog.sections),
+        "crear_seccion_us_per_entry": elapsed * 1e6 / max(1, entries),
+    }
+
+
+def measure_find_icon_path(catalog, pack, calls=2000):
+    """find_icon_path con la caché de rutas vacía (fría) y llena (caliente)"""
+    from cuerd_settings.icon_cache import IconCache
+
+    names = sorted({entry["icon"] for entry in catalog.entries()})
+    cold_cache = IconCache(root=APP_DIR)
+    start = time.perf_counter()
+    for name in names:
+        cold_cache.find_path(pack, name)
+    cold = (time.perf_counter() - start) / len(names)
+
+    start = time.perf_counter()
+    for number in range(calls):
+        cold_cache.find_path(pack, names[number % len(names)])
+    warm = (time.perf_counter() - start) / calls
+    return {"find_icon_path_cold_us": cold * 1e6, "find_icon_path_warm_us": warm * 1e6}
+
+
+def measure_pack_decoding(size=18):
+    """Decodificación de todos los iconos de cada paquete de ico/"""
+    from cuerd_settings.icon_cache import ICON_EXTENSIONS, IconCache
+    from cuerd_settings.icon_packs import discover_packs
+
+    results = {}
+    packs = discover_packs([os.path.join(APP_DIR, "ico")], os.path.join(os.environ["XDG_CACHE_HOME"], "packs.json"))
+    for pack, path in sorted(packs.items()):
+        names = sorted({os.path.splitext(name)[0] for name in os.listdir(path) if name.endswith(ICON_EXTENSIONS)})
+        cache = IconCache(root=APP_DIR, budget=1 << 30)
+        cache.register_packs({pack: path})
+        start = time.perf_counter()
+        for name in names:
+            cache.get(pack, name, size)
+        elapsed = time.perf_counter() - start
+        results[pack] = {"icons": len(names), "decode_ms": elapsed * 1000,
+                         "decode_us_per_icon": elapsed * 1e6 / max(1, len(names))}
+    return results
+
+
+def check_thresholds(results, thresholds):
+    """Lista de (medida, valor, umbral) que superan su umbral"""
+    failures = []
+    for scale, limits in thresholds.get("scales", {}).items():
+        measured = results["scales"].get(scale)
+        if measured is None:
+            continue
+        for metric, limit in limits.items():
+            value = measured.get(metric)
+            if value is not None and value > limit:
+                failures.append((f"{scale}.{metric}", value, limit))
+    for metric, limit in thresholds.get("packs", {}).items():
+        for pack, measured in results["packs"].items():
+            value = measured.get(metric)
+            if value is not None and value > limit:
+                failures.append((f"packs.{pack}.{metric}", value, limit))
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100",
+                        help="factores del catálogo sintético respecto al real (1 = ~35 entradas)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--backend", choices=("auto", "display", "xvfb", "broadway"), default="auto")
+    parser.add_argument("--output", help="archivo JSON de resultados")
+    parser.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    args = parser.parse_args()
+
+    server = start_display(args.backend)
+    workdir = tempfile.mkdtemp(prefix="cuerd-bench-")
+    isolate_environment(workdir)
+    try:
+        sys.path.insert(0, APP_DIR)
+        start = time.perf_counter()
+        import settings  # noqa: F401
+        import_ms = (time.perf_counter() - start) * 1000
+        from cuerd_settings import app
+        from cuerd_settings.catalog import load_catalog
+
+        base = load_catalog()
+        pack = app.PreferencesStore().get("icon_pack")
+
+        results = {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "backend": os.environ.get("GDK_BACKEND", "default"),
+            "python": sys.version.split()[0],
+            "import_settings_ms": import_ms,
+            "scales": {},
+        }
+        for factor in (float(value) for value in args.scales.split(",")):
+            catalog = synthetic_catalog(base, factor) if factor != 1 else base
+            label = f"{factor:g}x"
+            measured = {
+                "sections": len(catalog.sections),
+                "entries": sum(1 for _ in catalog.entries()),
+            }
+            measured.update(measure_construction(app, catalog, args.repeat))
+            measured.update(measure_crear_seccion(app, catalog))
+            measured.update(measure_find_icon_path(catalog, pack))
+            measured["rss_kib"], measured["rss_peak_kib"] = rss_kib()
+            results["scales"][label] = measured
+            print(f"{label}: {json.dumps(measured, indent=None)}")
+        results["packs"] = measure_pack_decoding()
+        print(f"packs: {json.dumps(results['packs'])}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if server is not None:
+            server.terminate()
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(results, output, indent=2)
+
+    try:
+        with open(args.thresholds) as thresholds_file:
+            thresholds = json.load(thresholds_file)
+    except (OSError, ValueError):
+        thresholds = {}
+    failures = check_thresholds(results, thresholds)
+    for metric, value, limit in failures:
+        print(f"REGRESIÓN {metric}: {value:.1f} > {limit}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
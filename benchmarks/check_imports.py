@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""Comprobar con ``-X importtime`` qué módulos carga el arranque.
+
+Uso:
+    python3 benchmarks/check_imports.py [--verbose] [--backend auto|display|xvfb|broadway]
+
+Se importa ``settings``, se construye ``ControlPanel`` y el proceso termina
+en cuanto se dibuja el primer fotograma; lo importado se compara con lo que
+ya importan GTK y PyGObject por sí solos. Termina con código 1 si alguno de
+los módulos que solo hacen falta después del primer fotograma (búsqueda,
+descubrimiento de .desktop, subprocess...) vuelve a cargarse al arrancar.
+Sin pantalla se usa el mismo servidor virtual que ``bench_panel.py``.
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from bench_panel import APP_DIR, isolate_environment, start_display
+
+# Módulos que no deben cargarse antes del primer fotograma
+DEFERRED_MODULES = (
+    "cuerd_settings.desktop_index",
+    "cuerd_settings.icon_bundles",
+    "cuerd_settings.icon_packs",
+    "cuerd_settings.mime_editor",
+    "cuerd_settings.mime_index",
+    "mmap",
+    "cuerd_settings.search_index",
+    "glob",
+    "shutil",
+    "subprocess",
+    "tempfile",
+    "unicodedata",
+    "xml",
+)
+
+# Arranque hasta el primer fotograma: se sale sin ejecutar nada de lo que viene después
+FIRST_FRAME = """
+import os, sys
+import settings
+from cuerd_settings import app
+from gi.repository import GLib, Gtk
+
+def first_draw(*args):
+    sys.stderr.flush()
+    os._exit(0)
+
+panel = app.ControlPanel()
+panel.connect_after("draw", first_draw)
+GLib.timeout_add_seconds(10, lambda: os._exit(2))
+panel.show_all()
+Gtk.main()
+"""
+
+GTK_IMPORT = (
+    "import gi; gi.require_version('Gtk', '3.0'); "
+    "from gi.repository import Gtk, Gdk, Gio, GLib"
+)
+
+
+def import_times(code):
+    """{módulo: microsegundos acumulados} según -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=APP_DIR, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "error")
+    times = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--verbose", action="store_true", help="mostrar los módulos propios del arranque")
+    parser.add_argument("--backend", choices=("auto", "display", "xvfb", "broadway"), default="auto")
+    args = parser.parse_args()
+
+    server = start_display(args.backend)
+    workdir = tempfile.mkdtemp(prefix="cuerd-imports-")
+    isolate_environment(workdir)
+    try:
+        baseline = import_times(GTK_IMPORT)
+        startup = import_times(FIRST_FRAME)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+        if server is not None:
+            server.terminate()
+    added = {name: us for name, us in startup.items() if name not in baseline}
+
+    print(f"import settings: {startup.get('settings', 0) / 1000:.1f} ms; hasta el primer fotograma "
+          f"{len(added)} módulos además de GTK")
+    if args.verbose:
+        for name, us in sorted(added.items(), key=lambda item: -item[1]):
+            print(f"  {us / 1000:8.2f} ms  {name}")
+
+    offenders = sorted(
+        name for name in added
+        if any(name == module or name.startswith(module + ".") for module in DEFERRED_MODULES)
+    )
+    for name in offenders:
+        print(f"Módulo diferido cargado al arrancar: {name}")
+    return 1 if offenders else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+# Módulos compartidos de CuerdOS Settings (caché de iconos, lanzador, etc.)
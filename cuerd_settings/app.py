@@ -0,0 +1,1088 @@
+import os
+import sys
+from cuerd_settings.startup_trace import tracer
+
+with tracer.span("import gi/Gtk", "import"):
+    import gi
+    gi.require_version("Gtk", "3.0")
+    from gi.repository import Gtk, Gdk, Gio, GLib
+from cuerd_settings.catalog import applies_to_session, load_catalog
+from cuerd_settings.command_index import CommandIndex
+from cuerd_settings.config_files import CONFIG_SECTION, ConfigFileWatcher, merge_file_entries
+from cuerd_settings.icon_cache import RESOURCE_SCHEME, icon_cache
+from cuerd_settings.icon_loader import IconLoader
+from cuerd_settings.idle_trim import IdleTrimmer
+from cuerd_settings.launch_spec import compile_command
+from cuerd_settings.launcher import Launcher, EXIT_NOT_FOUND, is_not_found
+from cuerd_settings.notifications import NotificationQueue
+from cuerd_settings.prefs import PreferencesStore
+from cuerd_settings.prewarm import Prewarmer
+from cuerd_settings.status_probes import StatusPoller, default_sources
+from cuerd_settings.telemetry import LaunchTelemetry
+from cuerd_settings.tiles import (
+    EntryItem, SectionModel, TilePool, TILE_HEIGHT, TILE_SPACING, TILE_WIDTH, columns_for_width,
+)
+
+# Identificador único en el bus de sesión: una segunda ejecución activa la
+# instancia que ya está abierta en lugar de construir otra ventana
+APP_ID = "org.cuerdos.Settings"
+
+# Modo residente: cerrar la ventana solo la oculta y el proceso sigue vivo
+RESIDENT_FLAG = "--resident"
+RESIDENT_ENV = "CUERD_SETTINGS_RESIDENT"
+
+# Altura aproximada de la barra de menús y del área visible inicial
+MENU_BAR_HEIGHT = 30
+DEFAULT_HEIGHT = 600
+
+# Con CUERD_SETTINGS_KILL_CHILDREN=1 se cierran las herramientas al salir
+KILL_CHILDREN_ENV = "CUERD_SETTINGS_KILL_CHILDREN"
+
+# Con CUERD_SETTINGS_HIDE_MISSING=1 se ocultan (en vez de atenuar) las herramientas no instaladas
+HIDE_MISSING_ENV = "CUERD_SETTINGS_HIDE_MISSING"
+
+# Número de herramientas en la sección "Frecuentes"
+FREQUENT_LIMIT = 6
+
+# Segundos que permanece visible la barra de errores
+ERROR_BAR_TIMEOUT = 10
+
+# Indicador de herramienta en ejecución sobre su botón
+RUNNING_CSS = b"""
+button.cuerd-running {
+    box-shadow: inset 0 -3px @theme_selected_bg_color;
+}
+"""
+
+class ControlPanel(Gtk.Window):
+    def __init__(self, catalog=None):
+        # Catálogo de secciones y textos en el idioma del sistema
+        if catalog is None:
+            with tracer.span("load_catalog"):
+                catalog = load_catalog()
+        self.catalog = catalog
+        _ = catalog.text
+
+        super().__init__(title=_("app_name"))
+
+        # Preferencias del usuario (XDG), recargadas si cambian desde fuera
+        self.prefs = PreferencesStore()
+        self.prefs.connect(self.on_prefs_changed)
+        self.prefs.watch()
+
+        # Detectar el servidor gráfico
+        display_server = os.getenv('XDG_SESSION_TYPE', 'X11')
+        self.display_server = display_server.lower()
+        print(f"Servidor gráfico detectado: {display_server}")
+
+        # Configurar el título de la ventana con el nombre del usuario
+        user_name = os.getenv("USER") or os.getenv("USERNAME")  # Obtener el nombre del usuario del sistema
+        self.set_title(_("greeting", user=user_name))
+
+        # Configurar la ventana con barra estándar de GTK
+        width, height = self.prefs.get("window_size", (800, DEFAULT_HEIGHT))
+        self.set_default_size(width, height)
+        self.connect("configure-event", self.on_configure_event)
+        self.set_position(Gtk.WindowPosition.CENTER)
+
+        # Si estamos en Wayland, habilitar bordes en la ventana
+        if display_server == 'Wayland':
+            self.set_decorated(True)  # Esto agrega los bordes de la ventana
+
+        # Caché compartida de iconos decodificados e imágenes creadas con ella
+        # (para cambiar de paquete sin reconstruir la ventana)
+        self.icon_cache = icon_cache
+        self.icon_images = {}
+
+        # Los iconos se decodifican en varios hilos y llegan por lotes al bucle principal
+        self.icon_loader = IconLoader(self.icon_cache, self.on_icon_loaded, on_idle=self.on_icons_decoded)
+        self.icon_report_pending = True
+
+        # Decodificar el icono directamente al tamaño de la barra de tareas
+        icon_pixbuf = self.icon_loader.request(None, "settings", 48, self)
+
+        # Si se encuentra el archivo, configuramos el icono para la ventana y para la barra de tareas
+        if icon_pixbuf:
+            self.set_icon(icon_pixbuf)  # Establece el icono para la ventana
+            self.set_default_icon(icon_pixbuf)  # Establece el icono para la barra de tareas
+
+        # Lanzador asíncrono con registro de las herramientas en ejecución
+        self.launcher = Launcher(
+            on_state_changed=self.on_launch_state_changed,
+            on_exited=self.on_launch_exited,
+            on_error=self.on_launch_error,
+        )
+        self.launch_buttons = {}
+        self.launch_specs = {}
+        # Ventanas propias abiertas desde el catálogo (entradas con "action")
+        self.action_windows = {}
+
+        # Botones reutilizables para las secciones enlazadas a su modelo
+        self.tile_pool = TilePool(self.create_tile, self.bind_tile, self.unbind_tile)
+
+        # Registro local de lanzamientos; la pérdida de foco de la ventana
+        # indica que la herramienta ha mostrado la suya
+        self.telemetry = LaunchTelemetry()
+
+        # Precarga de la herramienta al pasar el puntero por su botón
+        self.prewarmer = Prewarmer()
+        self.connect("focus-out-event", self.on_focus_out)
+
+        # Estado en vivo junto a los títulos (batería, red, disco); solo se
+        # consulta con la ventana visible y activa
+        self.status_poller = StatusPoller(default_sources(_))
+        # Tras un tiempo oculta o sin foco se liberan iconos y secciones fuera de la vista
+        self.idle_trimmer = IdleTrimmer(
+            self.trim_memory, self.restore_sections, self.prefs.get("idle_trim_seconds", 0)
+        )
+        self.connect("notify::is-active", self.on_visibility_changed)
+        self.connect("map", self.on_visibility_changed)
+        self.connect("unmap", self.on_visibility_changed)
+
+        # Índice de disponibilidad de los comandos, resuelto en segundo plano
+        self.command_index = CommandIndex()
+        self.catalog_commands = []
+        self.hide_missing = os.getenv(HIDE_MISSING_ENV) == "1"
+        self.connect("destroy", self.on_destroy)
+
+        css_provider = Gtk.CssProvider()
+        css_provider.load_from_data(RUNNING_CSS)
+        Gtk.StyleContext.add_provider_for_screen(
+            Gdk.Screen.get_default(), css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION
+        )
+
+        # Barra de menús
+        menu_bar = Gtk.MenuBar()
+
+        # Menú "Ayuda"
+        file_menu = Gtk.Menu()
+        file_item = Gtk.MenuItem(label=_("menu_help"))
+        file_item.set_submenu(file_menu)
+
+        acerca_item = Gtk.MenuItem(label=_("menu_about"))
+        acerca_item.connect("activate", self.show_about_dialog)
+        file_menu.append(acerca_item)
+
+        errors_item = Gtk.MenuItem(label=_("menu_errors"))
+        errors_item.connect("activate", self.show_error_history)
+        file_menu.append(errors_item)
+
+        # Menú "Configuración"
+        settings_menu = Gtk.Menu()
+        settings_item = Gtk.MenuItem(label=_("menu_settings"))
+        settings_item.set_submenu(settings_menu)
+
+        icon_pack_item = Gtk.MenuItem(label=_("menu_icon_pack"))
+        icon_pack_item.connect("activate", self.show_icon_pack_dialog)
+        settings_menu.append(icon_pack_item)
+
+        menu_bar.append(file_item)
+        menu_bar.append(settings_item)
+
+        # Contenedor principal con barra de desplazamiento
+        scrolled_window = Gtk.ScrolledWindow()
+        scrolled_window.set_vexpand(True)
+        scrolled_window.set_hexpand(True)
+        scrolled_window.set_policy(Gtk.PolicyType.NEVER, Gtk.PolicyType.AUTOMATIC)  # Deshabilitar desplazamiento horizontal
+        scrolled_window.get_vadjustment().connect("value-changed", self.on_scroll_changed)
+        self.scrolled_window = scrolled_window
+
+        # Solo las secciones que caben en la vista inicial se construyen antes
+        # del primer fotograma; el resto queda pendiente con un marcador
+        self.viewport_budget = height - MENU_BAR_HEIGHT
+        self.content_width = width - 40
+        self.pending_sections = []
+        self.idle_build_id = None
+        self.first_draw_id = self.connect("draw", self.on_first_draw)
+
+        # Errores de lanzamiento: cola segura entre hilos y barra no modal
+        self.notifications = NotificationQueue(self.on_notifications)
+        self.error_bar = Gtk.InfoBar()
+        self.error_bar.set_message_type(Gtk.MessageType.ERROR)
+        self.error_bar.set_show_close_button(True)
+        self.error_bar.connect("response", lambda bar, response: bar.set_revealed(False))
+        self.error_bar.set_revealed(False)
+        self.error_label = Gtk.Label()
+        self.error_label.set_line_wrap(True)
+        self.error_label.set_halign(Gtk.Align.START)
+        self.error_bar.get_content_area().add(self.error_label)
+        self.error_bar_timeout_id = None
+        self.error_history_window = None
+
+        # Barra de búsqueda; el índice se construye con la primera consulta
+        search_entry = Gtk.SearchEntry()
+        search_entry.set_placeholder_text(_("search_placeholder"))
+        search_entry.set_margin_start(20)
+        search_entry.set_margin_end(20)
+        search_entry.connect("search-changed", self.on_search_changed)
+        search_entry.connect("stop-search", lambda entry: entry.set_text(""))
+        self.search_entry = search_entry
+        self.search_index = None
+        self.search_index_id = None
+        self.search_entries = []
+        self.sections = {}
+        self.section_sources = {}
+
+        # Archivos de configuración: se comprueba en segundo plano cuáles existen
+        self.config_files = ConfigFileWatcher(self.on_config_files_scanned)
+        self.search_matches = None
+        self.section_models = {}
+        self.section_widgets = {}
+
+        # Crear un contenedor vertical para las secciones
+        main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        main_box.set_vexpand(True)
+        main_box.set_hexpand(True)
+        self.main_box = main_box
+
+        # Cargar la configuración del paquete de iconos
+        with tracer.span("load_icon_pack_config"):
+            self.load_icon_pack_config()
+            # Paquete instalado fuera de la carpeta de la aplicación (XDG)
+            if not os.path.isdir(self.icon_cache.pack_dir(self.icon_pack)):
+                from cuerd_settings.icon_packs import discover_packs
+
+                self.icon_cache.register_packs(discover_packs())
+
+        # Herramientas instaladas descubiertas en los .desktop (opcional)
+        self.desktop_index = None
+        self.discovered = {}
+        if self.prefs.discover_applications():
+            from cuerd_settings.desktop_index import DesktopIndex
+
+            with tracer.span("desktop_index"):
+                self.desktop_index = DesktopIndex().load()
+                self.discovered = self.discovered_entries()
+            self.desktop_index.watch(self.on_desktop_index_changed)
+
+        # Secciones definidas en el catálogo (catalog/catalog.json)
+        frecuentes = self.frequent_section()
+        if frecuentes is not None:
+            self.crear_seccion(main_box, frecuentes)
+        for seccion in catalog.sections:
+            self.crear_seccion(main_box, seccion)
+
+        self.command_index.resolve_in_background(self.catalog_commands, self.on_commands_resolved)
+        self.config_files.scan([
+            boton for seccion in self.sections.values() for boton in seccion["entries"] if boton.get("path")
+        ])
+
+        # Agregar el contenedor principal al contenedor de desplazamiento
+        scrolled_window.add(main_box)
+
+        # Agregar el contenedor principal a la ventana
+        window_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        window_box.pack_start(menu_bar, False, False, 0)
+        window_box.pack_start(self.error_bar, False, False, 0)
+        window_box.pack_start(search_entry, False, False, 0)
+        window_box.pack_start(scrolled_window, True, True, 0)
+
+        # Agregar el contenedor a la ventana
+        self.add(window_box)
+
+        # Con la decodificación en hilos el informe espera a que se vacíe la cola
+        if not self.icon_loader.busy():
+            self.on_icons_decoded()
+
+    def find_icon_path(self, icon_pack, icon_name):
+        """Buscar el archivo de icono con extensión .svg o .png"""
+        return self.icon_cache.find_path(icon_pack, icon_name)
+
+    def load_icon(self, icon_name, size):
+        # Crear la imagen a partir de la caché (vacía si el icono no existe)
+        image = Gtk.Image()
+        self.set_image_icon(image, icon_name, size)
+        # Las secciones liberadas por inactividad destruyen su icono
+        image.connect("destroy", lambda image: self.icon_images.pop(image, None))
+        return image
+
+    def set_image_icon(self, image, icon_name, size):
+        # Cambiar el icono de una imagen reutilizada (botones del modelo);
+        # mientras se decodifica se muestra un marcador transparente
+        self.icon_images[image] = (icon_name, size)
+        pixbuf = self.icon_loader.request(self.icon_pack, icon_name, size, image)
+        if pixbuf is None:
+            image.clear()
+        else:
+            image.set_from_pixbuf(pixbuf)
+
+    def on_icons_decoded(self):
+        # Iconos y memoria de la caché una vez decodificados los del arranque
+        if self.icon_report_pending:
+            self.icon_report_pending = False
+            print(f"Caché de iconos: {self.icon_cache.report()}")
+
+    def on_icon_loaded(self, target, key, pixbuf):
+        pack, icon_name, size = key
+        if target is self:
+            if pixbuf is not None:
+                self.set_icon(pixbuf)
+                self.set_default_icon(pixbuf)
+            return
+        # La imagen puede haberse reutilizado para otro icono o paquete mientras tanto
+        if pack != self.icon_pack or self.icon_images.get(target) != (icon_name, size):
+            return
+        if pixbuf is None:
+            target.clear()
+        else:
+            target.set_from_pixbuf(pixbuf)
+
+    def icon_requests(self, seccion):
+        # (paquete, nombre, tamaño) del título y los botones de la sección
+        yield self.icon_pack, seccion["icon"], 24
+        for boton in seccion["entries"]:
+            if not boton.get("themed_icon"):
+                yield self.icon_pack, boton["icon"], 18
+
+    def set_icon_pack(self, icon_pack):
+        """Cambiar los iconos en los botones y secciones ya construidos"""
+        old_pack, self.icon_pack = self.icon_pack, icon_pack
+        if old_pack == icon_pack:
+            return
+
+        changed = 0
+        for image, (icon_name, size) in list(self.icon_images.items()):
+            old_path = self.icon_cache.find_path(old_pack, icon_name)
+            new_path = self.icon_cache.find_path(icon_pack, icon_name)
+            # Solo se decodifican los iconos que realmente cambian
+            if old_path and new_path and self.same_icon_file(old_path, new_path):
+                continue
+            self.set_image_icon(image, icon_name, size)
+            changed += 1
+        print(f"Paquete de iconos cambiado a {icon_pack}: {changed} iconos actualizados")
+
+    @staticmethod
+    def same_icon_file(old_path, new_path):
+        # Las URI resource:// de paquetes compilados distintos nunca coinciden;
+        # las rutas de archivo se comparan tras resolver los enlaces entre paquetes
+        if old_path.startswith(RESOURCE_SCHEME) or new_path.startswith(RESOURCE_SCHEME):
+            return old_path == new_path
+        return os.path.realpath(old_path) == os.path.realpath(new_path)
+
+    def section_entries(self, seccion):
+        # Entradas del catálogo y descubiertas, sin las de otro tipo de sesión (X11/Wayland)
+        botones = seccion["entries"] + self.discovered.get(seccion["id"], [])
+        # Archivos de configuración: rutas expandidas, preferencias del usuario y tamaño/fecha
+        overrides = self.prefs.get("config_files", []) if seccion["id"] == CONFIG_SECTION else ()
+        botones = merge_file_entries(botones, overrides)
+        return [self.with_file_detail(boton) for boton in botones if self.applies_to_session(boton)]
+
+    def with_file_detail(self, boton):
+        info = self.config_files.info(boton["path"]) if boton.get("path") else None
+        if info is None:
+            return boton
+        size, mtime = info
+        modified = GLib.DateTime.new_from_unix_local(int(mtime)).format("%x %H:%M")
+        return {**boton, "detail": f"{GLib.format_size(size)} · {modified}"}
+
+    def register_commands(self, botones):
+        # Cada entrada se analiza una sola vez: argv, entorno, terminal, pkexec...
+        commands = [boton["command"] for boton in botones if boton["command"] not in self.launch_specs]
+        for command in commands:
+            self.launch_specs[command] = compile_command(command)
+        self.catalog_commands.extend(commands)
+        return commands
+
+    def crear_seccion(self, parent_box, seccion):
+        self.section_sources[seccion["id"]] = seccion
+        botones = self.section_entries(seccion)
+        seccion = {**seccion, "entries": botones}
+        self.register_commands(botones)
+        self.sections[seccion["id"]] = seccion
+        # Todas las secciones, construidas o no, piden sus iconos antes del primer fotograma
+        self.icon_loader.prefetch(self.icon_requests(seccion))
+
+        # Estimar la altura para reservar el espacio aunque no se construya aún
+        height = self.estimate_section_height(len(botones))
+        if self.viewport_budget > 0:
+            self.viewport_budget -= height
+            self.construir_seccion(parent_box, seccion)
+            return
+
+        # Marcador con la altura estimada para que la barra de desplazamiento no salte
+        placeholder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+        placeholder.set_size_request(-1, height)
+        parent_box.pack_start(placeholder, False, False, 0)
+        self.pending_sections.append((placeholder, seccion))
+
+    def estimate_section_height(self, num_buttons):
+        # Título (24) + descripción (~17) + márgenes, espaciados y filas de botones
+        rows = -(-num_buttons // columns_for_width(self.content_width))
+        return 24 + 17 + 2 * 5 + 5 + 10 + rows * TILE_HEIGHT + max(0, rows - 1) * TILE_SPACING + 10
+
+    def build_pending_section(self, placeholder):
+        # Construir la sección dentro de su marcador y liberar la altura reservada
+        for index, (pending, seccion) in enumerate(self.pending_sections):
+            if pending is placeholder:
+                del self.pending_sections[index]
+                self.construir_seccion(placeholder, seccion)
+                # Al filtrar se oculta el marcador completo, no solo la sección
+                self.section_widgets[seccion["id"]] = placeholder
+                placeholder.set_size_request(-1, -1)
+                placeholder.show_all()
+                self.refresh_section(seccion["id"])
+                return
+
+    def on_first_draw(self, widget, cr):  # pylint: disable=unused-argument
+        # Tras el primer fotograma, construir el resto en segundo plano
+        self.disconnect(self.first_draw_id)
+        self.first_draw_id = None
+        tracer.end("show_all -> primer draw")
+        tracer.finish()
+        if self.pending_sections and self.idle_build_id is None:
+            self.idle_build_id = GLib.idle_add(self.on_idle_build, priority=GLib.PRIORITY_LOW)
+        self.schedule_search_index()
+        return False
+
+    def on_idle_build(self):
+        # Una sección por iteración para no bloquear el bucle principal
+        if self.pending_sections:
+            self.build_pending_section(self.pending_sections[0][0])
+        if self.pending_sections:
+            return True
+        self.idle_build_id = None
+        # Añadir a la traza las secciones construidas tras el primer fotograma
+        tracer.write()
+        return False
+
+    def on_scroll_changed(self, adjustment):
+        # Construir de inmediato los marcadores que entran en la vista
+        top = adjustment.get_value()
+        bottom = top + adjustment.get_page_size()
+        for placeholder, _ in list(self.pending_sections):
+            allocation = placeholder.get_allocation()
+            if allocation.y < bottom and allocation.y + allocation.height > top:
+                self.build_pending_section(placeholder)
+
+    def construir_seccion(self, parent_box, seccion):
+        with tracer.span(f"crear_seccion {seccion['id']}", "section", buttons=len(seccion["entries"])):
+            self._construir_seccion(parent_box, seccion)
+
+    def _construir_seccion(self, parent_box, seccion):
+        botones = seccion["entries"]
+
+        # Crear un contenedor para la sección
+        section_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=5)
+        section_box.set_margin_start(20)
+        section_box.set_margin_end(20)
+        section_box.set_margin_top(5)
+        section_box.set_margin_bottom(10)
+        section_box.set_hexpand(True)
+        section_box.set_vexpand(True)
+
+        # Crear un contenedor horizontal para el título y el icono
+        title_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=5)
+        icon = self.load_icon(seccion["icon"], 24)
+        title_box.pack_start(icon, False, False, 0)
+
+        # Crear un título para la sección
+        section_label = Gtk.Label(label=f"<b>{GLib.markup_escape_text(seccion['title'])}</b>")
+        section_label.set_justify(Gtk.Justification.LEFT)
+        section_label.set_use_markup(True)
+        section_label.set_halign(Gtk.Align.START)
+        title_box.pack_start(section_label, False, False, 0)
+
+        # Estado en vivo, si la sección tiene alguna lectura asociada
+        status_label = Gtk.Label()
+        status_label.get_style_context().add_class("dim-label")
+        status_label.set_no_show_all(True)
+        title_box.pack_start(status_label, False, False, 10)
+        self.status_poller.attach(seccion["id"], status_label)
+
+        # Agregar el contenedor del título a la sección
+        section_box.pack_start(title_box, False, False, 0)
+
+        # Crear una etiqueta para la descripción
+        description_label = Gtk.Label(label=seccion["description"])
+        description_label.set_justify(Gtk.Justification.LEFT)
+        description_label.set_halign(Gtk.Align.START)
+        section_box.pack_start(description_label, False, False, 0)
+
+        # Los botones se generan desde un modelo y se reparten en filas según
+        # el ancho de la ventana; al filtrar se reutilizan en lugar de recrearse
+        store = Gio.ListStore.new(EntryItem)
+        flowbox = Gtk.FlowBox()
+        flowbox.set_selection_mode(Gtk.SelectionMode.NONE)
+        flowbox.set_homogeneous(True)
+        flowbox.set_min_children_per_line(1)
+        flowbox.set_max_children_per_line(64)
+        flowbox.set_row_spacing(TILE_SPACING)
+        flowbox.set_column_spacing(TILE_SPACING)
+        flowbox.set_hexpand(True)
+        # Una FlowBox con modelo ignora las funciones de filtro: se filtra el modelo
+        flowbox.bind_model(store, self.tile_pool.acquire)
+
+        model = SectionModel(store, botones)
+        self.section_models[seccion["id"]] = model
+        model.show([item for item in model.items if self.entry_visible(seccion["id"], item.entry)])
+
+        section_box.pack_start(flowbox, True, True, 0)
+        parent_box.pack_start(section_box, False, False, 0)
+        self.section_widgets[seccion["id"]] = section_box
+
+    def search_documents(self):
+        # Entradas de todas las secciones, construidas o no, desde los datos del catálogo
+        self.search_entries = [
+            (boton, seccion) for seccion in self.sections.values() for boton in seccion["entries"]
+        ]
+        return [
+            (boton["label"], seccion["title"], seccion["description"], boton["command"])
+            for boton, seccion in self.search_entries
+        ]
+
+    def schedule_search_index(self):
+        # El índice se construye en una iteración libre del bucle, no con la primera tecla
+        if self.search_index is None and self.search_index_id is None:
+            self.search_index_id = GLib.idle_add(self.on_build_search_index, priority=GLib.PRIORITY_LOW)
+
+    def on_build_search_index(self):
+        from cuerd_settings.search_index import SearchIndex
+
+        self.search_index_id = None
+        with tracer.span("construir índice de búsqueda", "search"):
+            self.search_index = SearchIndex(self.search_documents())
+        # Consulta escrita antes de que el índice estuviera listo
+        if self.search_entry.get_text():
+            self.on_search_changed(self.search_entry)
+        return False
+
+    def on_search_changed(self, entry):
+        # Solo se filtra: las secciones pendientes aplican la búsqueda al construirse
+        if self.search_index is None:
+            from cuerd_settings.search_index import scan
+
+            self.schedule_search_index()
+            self.search_matches = scan(self.search_documents(), entry.get_text())
+        else:
+            self.search_matches = self.search_index.search(entry.get_text())
+        if self.search_matches is not None:
+            self.search_matches = {
+                (self.search_entries[doc_id][1]["id"], self.search_entries[doc_id][0]["id"])
+                for doc_id in self.search_matches
+            }
+        self.refresh_sections()
+
+    def entry_visible(self, section_id, boton):
+        # Entradas que pasan la búsqueda y, si se ocultan, están instaladas
+        return (
+            (self.search_matches is None or (section_id, boton["id"]) in self.search_matches)
+            and not (self.hide_missing and self.command_index.missing.get(boton["command"]))
+            # Los archivos de configuración solo se muestran si existen
+            and not (boton.get("path") and self.config_files.info(boton["path"]) is None)
+        )
+
+    def refresh_sections(self):
+        for section_id in self.section_models:
+            self.refresh_section(section_id)
+        # Las secciones sin construir conservan su marcador solo si algo coincide
+        for placeholder, seccion in self.pending_sections:
+            placeholder.set_visible(any(self.entry_visible(seccion["id"], boton) for boton in seccion["entries"]))
+
+    def refresh_section(self, section_id):
+        model = self.section_models[section_id]
+        # Solo entran o salen del modelo los botones que cambian de estado
+        visible = [item for item in model.items if self.entry_visible(section_id, item.entry)]
+        model.show(visible)
+        self.section_widgets[section_id].set_visible(bool(visible))
+
+    def discovered_entries(self):
+        from cuerd_settings.desktop_index import remove_duplicates
+
+        # Las aplicaciones que ya lanza el catálogo no se repiten
+        return remove_duplicates(
+            self.desktop_index.entries(self.catalog.locale),
+            [boton["command"] for boton in self.catalog.entries()],
+        )
+
+    def on_desktop_index_changed(self):
+        # Aplicaciones instaladas o eliminadas con la ventana abierta
+        self.discovered = self.discovered_entries()
+        self.update_sections()
+
+    def on_config_files_scanned(self, found):  # pylint: disable=unused-argument
+        # Archivos de configuración creados, modificados o borrados
+        self.update_sections()
+
+    def update_sections(self):
+        # Recalcular las entradas de las secciones ya creadas (construidas o pendientes)
+        new_commands = []
+        for seccion in self.section_sources.values():
+            current = self.sections[seccion["id"]]
+            # El mismo diccionario lo comparten las secciones aún pendientes
+            current["entries"] = self.section_entries(seccion)
+            new_commands.extend(self.register_commands(current["entries"]))
+            model = self.section_models.get(seccion["id"])
+            if model is not None:
+                # Los elementos iguales se conservan; refresh_sections aplica el filtro
+                model.set_entries(current["entries"])
+        self.search_index = None
+        if self.first_draw_id is None:
+            self.schedule_search_index()
+        if self.search_entry.get_text():
+            self.on_search_changed(self.search_entry)
+        else:
+            self.refresh_sections()
+        if new_commands:
+            self.command_index.resolve_in_background(new_commands, self.on_commands_resolved)
+
+    def set_entry_icon(self, image, boton):
+        if not boton.get("themed_icon"):
+            self.set_image_icon(image, boton["icon"], 18)
+            return
+        # Icono del tema o ruta absoluta de un .desktop: fuera de los paquetes
+        self.icon_images.pop(image, None)
+        try:
+            image.set_from_gicon(Gio.Icon.new_for_string(boton["icon"]), Gtk.IconSize.BUTTON)
+            image.set_pixel_size(18)
+        except GLib.Error:
+            image.clear()
+
+    def create_tile(self):
+        button = Gtk.Button()
+        button.set_image(Gtk.Image())
+        button.set_always_show_image(True)
+        button.set_hexpand(True)
+        button.set_size_request(TILE_WIDTH, TILE_HEIGHT)
+        button.connect("clicked", self.on_button_clicked)
+        button.connect("enter-notify-event", self.on_button_hover)
+        return button
+
+    def bind_tile(self, button, boton):
+        command = boton["command"]
+        # Los archivos de configuración muestran además su tamaño y fecha
+        button.set_label(f"{boton['label']}\n{boton['detail']}" if boton.get("detail") else boton["label"])
+        self.set_entry_icon(button.get_image(), boton)
+        self.launch_buttons.setdefault(command, []).append(button)
+        self.apply_availability(button, command)
+        if self.launcher.is_running(command) or command in self.action_windows:
+            self.on_launch_state_changed(command, True)
+
+    def unbind_tile(self, button, boton):
+        self.launch_buttons[boton["command"]].remove(button)
+        self.icon_images.pop(button.get_image(), None)
+        button.get_style_context().remove_class("cuerd-running")
+
+    def applies_to_session(self, boton):
+        return applies_to_session(boton, self.display_server)
+
+    def apply_availability(self, button, command):
+        # Los botones se reutilizan: restablecer también el estado disponible
+        missing = self.command_index.missing.get(command)
+        button.set_sensitive(not missing)
+        if missing:
+            button.set_tooltip_text(self.catalog.text("not_installed", programs=", ".join(missing)))
+        else:
+            button.set_tooltip_text(None)
+
+    def on_commands_resolved(self, results):
+        # Aplicar el resultado a los botones ya construidos; los pendientes lo
+        # aplican al construirse
+        if self.hide_missing:
+            self.refresh_sections()
+        for command in results:
+            for button in self.launch_buttons.get(command, []):
+                self.apply_availability(button, command)
+        return False
+
+    def frequent_section(self):
+        # Sección "Frecuentes" con las herramientas más usadas recientemente
+        entries = {boton["id"]: boton for boton in self.catalog.entries()}
+        for botones in self.discovered.values():
+            entries.update((boton["id"], boton) for boton in botones)
+        ranked = [entries[entry_id] for entry_id in self.telemetry.ranked(FREQUENT_LIMIT) if entry_id in entries]
+        if not ranked:
+            return None
+        return {
+            "id": "frequent",
+            "title": self.catalog.text("frequent_title"),
+            "description": self.catalog.text("frequent_description"),
+            "icon": "launch",
+            "entries": ranked,
+        }
+
+    def on_button_hover(self, widget, event):  # pylint: disable=unused-argument
+        boton = self.tile_pool.entry(widget)
+        command = boton["command"]
+        # Aprovechar el tiempo entre pasar el puntero y hacer clic para leer
+        # el ejecutable y sus bibliotecas del disco
+        if not boton.get("action") and self.command_index.is_available(command):
+            self.prewarmer.request(command)
+        return False
+
+    def on_button_clicked(self, widget):
+        boton = self.tile_pool.entry(widget)
+        command = boton["command"]
+        if boton.get("action"):
+            self.run_action(boton)
+            return
+        if self.launcher.is_running(command):
+            # Clic repetido: no se lanza de nuevo ni se registra
+            print(f"Ya se está ejecutando, se ignora el clic: {command}")
+            return
+        self.telemetry.start(command, boton["id"])
+        if self.run_command(command):
+            self.telemetry.spawned(command)
+        else:
+            self.telemetry.discard(command)
+
+    def run_action(self, boton):
+        # Páginas propias: se abren en este proceso en lugar de lanzar el comando
+        command = boton["command"]
+        window = self.action_windows.get(command)
+        if window is None:
+            window = self.create_action_window(boton["action"])
+            if window is None:
+                print(f"Acción desconocida: {boton['action']}")
+                return
+            window.connect("destroy", self.on_action_window_destroy, command)
+            self.action_windows[command] = window
+            self.telemetry.start(command, boton["id"])
+            self.telemetry.spawned(command)
+            self.on_launch_state_changed(command, True)
+        window.show_all()
+        window.present()
+
+    def create_action_window(self, action):
+        if action == "default-apps":
+            from cuerd_settings.mime_editor import DefaultAppsWindow
+
+            return DefaultAppsWindow(self.catalog, transient_for=self)
+        return None
+
+    def on_action_window_destroy(self, window, command):  # pylint: disable=unused-argument
+        self.action_windows.pop(command, None)
+        self.telemetry.finish(command, 0, None)
+        self.on_launch_state_changed(command, False)
+
+    def run_command(self, command):
+        # Ejecutar directamente el programa; /bin/sh solo si la línea usa sintaxis de shell
+        spec = self.launch_specs.get(command) or compile_command(command)
+        if self.launcher.launch(command, spec.argv, spec.envp()):
+            print(f"Comando ejecutado: {spec.argv}")
+            return True
+        return False
+
+    def on_focus_out(self, widget, event):  # pylint: disable=unused-argument
+        self.telemetry.window_mapped()
+        return False
+
+    def on_visibility_changed(self, *args):  # pylint: disable=unused-argument
+        # Sin temporizadores mientras la ventana está oculta o sin foco
+        active = self.get_mapped() and self.is_active()
+        self.status_poller.set_active(active)
+        self.idle_trimmer.set_idle(not active)
+
+    def trim_memory(self):
+        """Liberar los iconos decodificados y las secciones fuera de la vista"""
+        if self.first_draw_id is not None:
+            return None
+        if self.idle_build_id is not None:
+            GLib.source_remove(self.idle_build_id)
+            self.idle_build_id = None
+
+        # Con la ventana oculta no hay nada a la vista
+        top = bottom = 0
+        if self.get_mapped():
+            adjustment = self.scrolled_window.get_vadjustment()
+            top = adjustment.get_value()
+            bottom = top + adjustment.get_page_size()
+
+        released = 0
+        for section_id in list(self.section_models):
+            widget = self.section_widgets[section_id]
+            allocation = widget.get_allocation()
+            # Se conservan las que están a la vista; las ocultas por la búsqueda también se liberan
+            if widget.get_visible() and allocation.y < bottom and allocation.y + allocation.height > top:
+                continue
+            self.release_section(section_id)
+            released += 1
+        # Reconstruir después de arriba abajo
+        self.pending_sections.sort(key=lambda pending: self.main_box.child_get_property(pending[0], "position"))
+
+        icons = self.icon_cache.stats()["entries"]
+        self.icon_cache.clear()
+        tiles = self.tile_pool.trim()
+        # El índice de búsqueda se vuelve a construir con la siguiente consulta (mientras, búsqueda lineal)
+        self.search_index = None
+        self.search_entries = []
+        return f"{released} secciones, {tiles} botones y {icons} iconos liberados"
+
+    def release_section(self, section_id):
+        # Volver a dejar la sección como un marcador con su altura actual
+        widget = self.section_widgets.pop(section_id)
+        model = self.section_models.pop(section_id)
+        model.show([])
+        visible = widget.get_visible()
+        self.status_poller.detach(section_id)
+        height = max(widget.get_allocated_height(), 1)
+        # Un marcador construido contiene solo la sección; la sección tiene título, descripción y botones
+        if len(widget.get_children()) > 1:
+            position = self.main_box.child_get_property(widget, "position")
+            placeholder = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+            self.main_box.pack_start(placeholder, False, False, 0)
+            self.main_box.reorder_child(placeholder, position)
+            widget.destroy()
+        else:
+            placeholder = widget
+            for child in placeholder.get_children():
+                child.destroy()
+        placeholder.set_size_request(-1, height)
+        # Una sección oculta por la búsqueda deja su marcador también oculto
+        placeholder.set_visible(visible)
+        self.pending_sections.append((placeholder, self.sections[section_id]))
+
+    def restore_sections(self):
+        # Construir de inmediato lo que está a la vista y el resto en segundo plano
+        pending = len(self.pending_sections)
+        # La búsqueda ya no construye secciones: primero se decide qué marcadores se ven
+        if self.search_entry.get_text():
+            self.on_search_changed(self.search_entry)
+        self.on_scroll_changed(self.scrolled_window.get_vadjustment())
+        if self.pending_sections and self.idle_build_id is None:
+            self.idle_build_id = GLib.idle_add(self.on_idle_build, priority=GLib.PRIORITY_LOW)
+        return f"{pending - len(self.pending_sections)} secciones reconstruidas"
+
+    def on_launch_state_changed(self, command, running):
+        # Marcar los botones de la herramienta mientras está en ejecución
+        for button in self.launch_buttons.get(command, []):
+            style = button.get_style_context()
+            if running:
+                style.add_class("cuerd-running")
+                button.set_tooltip_text(self.catalog.text("running"))
+            else:
+                style.remove_class("cuerd-running")
+                # Volver al aviso de "no instalado" si lo había
+                self.apply_availability(button, command)
+
+    def on_launch_exited(self, command, exit_code, signum):
+        self.telemetry.finish(command, exit_code, signum)
+        if exit_code == 0 or signum is not None:
+            return
+        if exit_code == EXIT_NOT_FOUND:
+            print(f"Comando no encontrado: {command}")
+            self.notify_error(command, self.catalog.text("error_not_found", command=command))
+        # Si el comando es qt5ct, no mostrar el mensaje de error
+        elif 'qt5ct' in command:
+            print(f"Error ejecutando el comando {command}: código {exit_code}")
+        else:
+            print(f"Error ejecutando el comando {command}: código {exit_code}")
+            self.notify_error(command, self.catalog.text("error_failed", command=command))
+
+    def on_launch_error(self, command, error):
+        self.telemetry.discard(command)
+        if is_not_found(error):
+            self.notify_error(command, self.catalog.text("error_not_found", command=command))
+        else:
+            self.notify_error(command, self.catalog.text("error_generic", error=getattr(error, "message", error)))
+
+    def on_destroy(self, widget):  # pylint: disable=unused-argument
+        self.status_poller.set_active(False)
+        self.idle_trimmer.stop()
+        self.icon_loader.shutdown()
+        self.launcher.shutdown(terminate=os.getenv(KILL_CHILDREN_ENV) == "1")
+        self.telemetry.shutdown()
+        # Escribir los cambios pendientes sin esperar al temporizador
+        self.prefs.flush()
+
+    def on_configure_event(self, widget, event):  # pylint: disable=unused-argument
+        # Se llama muchas veces al redimensionar; el almacén agrupa las escrituras
+        self.prefs.set("window_size", list(self.get_size()))
+        return False
+
+    def on_prefs_changed(self, key, value):
+        # Cambios hechos por otra instancia o a mano en settings.json
+        if key == "icon_pack" and value != self.icon_pack:
+            self.set_icon_pack(value)
+        elif key == "idle_trim_seconds":
+            self.idle_trimmer.delay = value or 0
+        elif key == "config_files":
+            self.update_sections()
+            self.config_files.scan([
+                boton for seccion in self.sections.values() for boton in seccion["entries"] if boton.get("path")
+            ])
+
+    def notify_error(self, command, message):
+        # Se puede llamar desde cualquier hilo: el aviso llega por la cola
+        self.notifications.post(command, message, self.catalog.text("error_hint"))
+
+    def on_notifications(self, notifications):
+        # Mostrar el aviso más reciente; los repetidos se indican con su contador
+        latest = notifications[-1]
+        message = latest.message
+        if latest.count > 1:
+            message = self.catalog.text("error_repeated", message=message, count=latest.count)
+        if len(notifications) > 1:
+            message += "\n" + self.catalog.text("error_more", count=len(notifications) - 1)
+        self.error_label.set_text(f"{message}\n{latest.detail}")
+        self.error_bar.show_all()
+        self.error_bar.set_revealed(True)
+
+        if self.error_bar_timeout_id is not None:
+            GLib.source_remove(self.error_bar_timeout_id)
+        self.error_bar_timeout_id = GLib.timeout_add_seconds(ERROR_BAR_TIMEOUT, self.on_error_bar_timeout)
+
+        if self.error_history_window is not None:
+            self.fill_error_history()
+
+    def on_error_bar_timeout(self):
+        self.error_bar_timeout_id = None
+        self.error_bar.set_revealed(False)
+        return False
+
+    def show_error_history(self, widget):  # pylint: disable=unused-argument
+        # Ventana no modal con los últimos errores
+        if self.error_history_window is None:
+            window = Gtk.Window(title=self.catalog.text("menu_errors"), transient_for=self)
+            window.set_default_size(500, 300)
+            window.connect("destroy", self.on_error_history_destroy)
+            scrolled = Gtk.ScrolledWindow()
+            self.error_history_list = Gtk.ListBox()
+            self.error_history_list.set_selection_mode(Gtk.SelectionMode.NONE)
+            scrolled.add(self.error_history_list)
+            window.add(scrolled)
+            self.error_history_window = window
+        self.fill_error_history()
+        self.error_history_window.show_all()
+        self.error_history_window.present()
+
+    def fill_error_history(self):
+        for row in self.error_history_list.get_children():
+            self.error_history_list.remove(row)
+        for notification in reversed(self.notifications.history):
+            timestamp = GLib.DateTime.new_from_unix_local(int(notification.last_time)).format("%X")
+            text = notification.message
+            if notification.count > 1:
+                text = self.catalog.text("error_repeated", message=text, count=notification.count)
+            label = Gtk.Label(label=f"{timestamp}  {text}")
+            label.set_halign(Gtk.Align.START)
+            label.set_margin_start(10)
+            self.error_history_list.add(label)
+        self.error_history_list.show_all()
+
+    def on_error_history_destroy(self, window):  # pylint: disable=unused-argument
+        self.error_history_window = None
+
+    def show_about_dialog(self, widget):  # pylint: disable=unused-argument
+        about_dialog = Gtk.AboutDialog()
+        about_dialog.set_program_name(self.catalog.text("app_name"))
+        about_dialog.set_version("1.0 v300125a Elena")
+        about_dialog.set_comments(self.catalog.text("about_comments"))
+        about_dialog.set_website("https://github.com/CuerdOS")
+        about_dialog.set_website_label("GitHub")
+        about_dialog.set_license_type(Gtk.License.GPL_3_0)
+        
+        about_dialog.set_authors([
+            "Ale D.M ",
+            "Leo H. Pérez (GatoVerde95)",
+            "Pablo G.",
+            "Welkis",
+            "GatoVerde95 Studios",
+            "CuerdOS Community"
+        ])
+        about_dialog.set_copyright("© 2025 CuerdOS")
+
+        # Logo decodificado directamente a 150x150 desde la caché
+        logo_pixbuf = self.icon_cache.get(None, "settings_about", 150)
+        if logo_pixbuf:
+            about_dialog.set_logo(logo_pixbuf)
+
+        about_dialog.run()
+        about_dialog.destroy()
+
+    def show_icon_pack_dialog(self, widget):  # pylint: disable=unused-argument
+        dialog = Gtk.Dialog(title=self.catalog.text("menu_icon_pack"), transient_for=self, flags=0)
+        dialog.add_buttons(Gtk.STOCK_CANCEL, Gtk.ResponseType.CANCEL, Gtk.STOCK_OK, Gtk.ResponseType.OK)
+        
+        box = dialog.get_content_area()
+        label = Gtk.Label(label=self.catalog.text("icon_pack_prompt"))
+        box.add(label)
+
+        icon_pack_store = Gtk.ListStore(str)
+        
+        # Detectar paquetes de iconos en la carpeta de la aplicación y en las carpetas XDG
+        from cuerd_settings.icon_packs import discover_packs
+
+        packs = discover_packs()
+        self.icon_cache.register_packs(packs)
+        self.icon_loader.reset()
+        icon_packs = list(packs)
+
+        for pack in icon_packs:
+            icon_pack_store.append([pack])
+        
+        combo = Gtk.ComboBox.new_with_model(icon_pack_store)
+        renderer_text = Gtk.CellRendererText()
+        combo.pack_start(renderer_text, True)
+        combo.add_attribute(renderer_text, "text", 0)
+        
+        # Seleccionar el paquete actual (o "CuerdOS-Elementary")
+        if self.icon_pack in icon_packs:
+            default_index = icon_packs.index(self.icon_pack)
+        else:
+            default_index = icon_packs.index("CuerdOS-Elementary") if "CuerdOS-Elementary" in icon_packs else 0
+        combo.set_active(default_index)
+        box.add(combo)
+
+        dialog.show_all()
+        response = dialog.run()
+
+        if response == Gtk.ResponseType.OK:
+            model = combo.get_model()
+            index = combo.get_active()
+            selected_pack = model[index][0]
+            self.save_icon_pack_config(selected_pack)
+            self.set_icon_pack(selected_pack)
+
+        dialog.destroy()
+
+    def save_icon_pack_config(self, icon_pack):
+        self.prefs.set("icon_pack", icon_pack)
+        print(f"Configuración del paquete de iconos guardada: {icon_pack}")
+
+    def load_icon_pack_config(self):
+        self.icon_pack = self.prefs.get("icon_pack")
+        print(f"Configuración del paquete de iconos cargada: {self.icon_pack}")
+
+class SettingsApplication(Gtk.Application):
+    def __init__(self, resident=False):
+        super().__init__(application_id=APP_ID, flags=Gio.ApplicationFlags.FLAGS_NONE)
+        self.resident = resident
+        self.window = None
+
+    def do_activate(self):
+        # Segunda ejecución (o activación por D-Bus): mostrar la ventana existente
+        if self.window is not None:
+            self.window.present()
+            return
+
+        with tracer.span("ControlPanel()"):
+            self.window = ControlPanel()
+        self.add_window(self.window)
+        if self.resident:
+            self.window.connect("delete-event", self.on_delete_event)
+            # Mantener la aplicación viva aunque no haya ventanas visibles
+            self.hold()
+
+        tracer.begin("show_all -> primer draw")
+        self.window.show_all()
+
+    def on_delete_event(self, window, event):  # pylint: disable=unused-argument
+        # En modo residente, ocultar en lugar de destruir
+        window.hide()
+        return True
+
+    def do_shutdown(self):
+        if self.window is not None:
+            self.window.destroy()
+        Gtk.Application.do_shutdown(self)
+
+
+def main():
+    # Retirar la opción propia para que Gtk.Application no la rechace
+    resident = os.getenv(RESIDENT_ENV) == "1"
+    if RESIDENT_FLAG in sys.argv:
+        sys.argv.remove(RESIDENT_FLAG)
+        resident = True
+
+    app = SettingsApplication(resident=resident)
+    return app.run(sys.argv)
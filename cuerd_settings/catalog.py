@@ -0,0 +1,207 @@
+import hashlib
+import json
+import marshal
+import os
+import sys
+
+from cuerd_settings import xdg
+
+# Carpeta de la aplicación (donde están settings.py y catalog/)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CATALOG_DIR = os.path.join(APP_DIR, "catalog")
+SOURCE_FILE = "catalog.json"
+LOCALE_DIR = "locale"
+COMPILED_FILE = "catalog.bin"
+
+# Cabecera del catálogo compilado: firma + sha256 del contenido en marshal
+MAGIC = b"CUERDCAT1\n"
+
+# Fuerza el idioma de la interfaz (por ejemplo CUERD_SETTINGS_LANG=en)
+LANG_ENV = "CUERD_SETTINGS_LANG"
+
+
+def _source_paths(catalog_dir):
+    paths = [os.path.join(catalog_dir, SOURCE_FILE)]
+    locale_dir = os.path.join(catalog_dir, LOCALE_DIR)
+    try:
+        names = sorted(name for name in os.listdir(locale_dir) if name.endswith(".json"))
+    except OSError:
+        names = []
+    paths.extend(os.path.join(locale_dir, name) for name in names)
+    return paths
+
+
+def _source_signature(paths):
+    signature = []
+    for path in paths:
+        st = os.stat(path)
+        signature.append([os.path.basename(path), st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def _source_hash(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as source:
+            digest.update(os.path.basename(path).encode() + b"\0")
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def _build_payload(catalog_dir):
+    """Leer los JSON y resolver las cadenas de cada idioma"""
+    paths = _source_paths(catalog_dir)
+    with open(paths[0]) as source:
+        structure = json.load(source)
+
+    tables = {}
+    for path in paths[1:]:
+        with open(path) as source:
+            tables[os.path.splitext(os.path.basename(path))[0]] = json.load(source)
+
+    default_locale = structure.get("default_locale", "es")
+    default_table = tables.get(default_locale, {})
+
+    locales = {}
+    for locale, table in tables.items():
+        section_strings = {**default_table.get("sections", {}), **table.get("sections", {})}
+        entry_strings = {**default_table.get("entries", {}), **table.get("entries", {})}
+        sections = []
+        for section in structure["sections"]:
+            title, description = section_strings.get(section["id"], (section["id"], ""))
+            entries = []
+            for entry in section["entries"]:
+                entries.append({
+                    "id": entry["id"],
+                    "label": entry_strings.get(entry["id"], entry["id"]),
+                    # Las entradas con "path" abren ese archivo si existe (config_files)
+                    "command": entry.get("command") or f"xdg-open {entry['path']}",
+                    "path": entry.get("path"),
+                    # Las entradas con "action" se abren dentro del panel; "command" es
+                    # la alternativa fuera de él (--launch)
+                    "action": entry.get("action"),
+                    "icon": entry["icon"],
+                    "session": entry.get("session"),
+                    "section": section["id"],
+                })
+            sections.append({
+                "id": section["id"],
+                "title": title,
+                "description": description,
+                "icon": section["icon"],
+                "entries": entries,
+            })
+        locales[locale] = {
+            "sections": sections,
+            "ui": {**default_table.get("ui", {}), **table.get("ui", {})},
+        }
+
+    return {
+        "version": structure.get("version", 1),
+        "default_locale": default_locale,
+        "sources": _source_signature(paths),
+        "source_hash": _source_hash(paths),
+        "locales": locales,
+    }
+
+
+def compile_catalog(catalog_dir=CATALOG_DIR, output=None):
+    """Compilar el catálogo (en la instalación) a un blob marshal validado por hash"""
+    payload = _build_payload(catalog_dir)
+    data = marshal.dumps(payload)
+    output = output or os.path.join(catalog_dir, COMPILED_FILE)
+    xdg.write_atomic(output, MAGIC + hashlib.sha256(data).digest() + data)
+    return output
+
+
+def _load_compiled(catalog_dir):
+    try:
+        with open(os.path.join(catalog_dir, COMPILED_FILE), "rb") as compiled:
+            blob = compiled.read()
+    except OSError:
+        return None
+
+    header = len(MAGIC) + 32
+    if not blob.startswith(MAGIC) or len(blob) < header:
+        print("Catálogo compilado no válido, se usa el JSON")
+        return None
+    data = blob[header:]
+    if hashlib.sha256(data).digest() != blob[len(MAGIC):header]:
+        print("El hash del catálogo compilado no coincide, se usa el JSON")
+        return None
+    try:
+        payload = marshal.loads(data)
+    except (EOFError, ValueError, TypeError):
+        return None
+
+    # Comprobar que las fuentes no han cambiado desde la compilación: primero
+    # tamaño y fecha (barato) y, si difieren, el contenido
+    paths = _source_paths(catalog_dir)
+    try:
+        if _source_signature(paths) != payload["sources"] and _source_hash(paths) != payload["source_hash"]:
+            print("El catálogo compilado está desactualizado, se usa el JSON")
+            return None
+    except OSError:
+        # Instalación sin las fuentes JSON: el blob es la única referencia
+        pass
+    return payload
+
+
+def detect_locale(available, default):
+    """Elegir el idioma como lo haría gettext: LC_ALL, LC_MESSAGES y LANG"""
+    for var in (LANG_ENV, "LC_ALL", "LC_MESSAGES", "LANG"):
+        value = os.environ.get(var)
+        if not value:
+            continue
+        language = value.split(".")[0].split("@")[0].split("_")[0]
+        return language if language in available else default
+    return default
+
+
+def applies_to_session(entry, display_server):
+    """El campo opcional "session" indica la sesión (x11/wayland) en la que tiene sentido"""
+    if not entry.get("session") or display_server not in ("x11", "wayland"):
+        return True
+    return entry["session"] == display_server
+
+
+class Catalog:
+    """Catálogo de secciones y entradas ya traducido a un idioma"""
+
+    def __init__(self, locale, sections, strings):
+        self.locale = locale
+        self.sections = sections
+        self.strings = strings
+        for section in sections:
+            for entry in section["entries"]:
+                entry["command"] = entry["command"].replace("{appdir}", APP_DIR)
+
+    def text(self, key, **kwargs):
+        value = self.strings.get(key, key)
+        return value.format(**kwargs) if kwargs else value
+
+    def entries(self):
+        for section in self.sections:
+            yield from section["entries"]
+
+    def find_entry(self, entry_id):
+        for entry in self.entries():
+            if entry["id"] == entry_id:
+                return entry
+        return None
+
+
+def load_catalog(locale=None, catalog_dir=CATALOG_DIR):
+    payload = _load_compiled(catalog_dir)
+    if payload is None:
+        payload = _build_payload(catalog_dir)
+
+    locales = payload["locales"]
+    locale = locale if locale in locales else detect_locale(locales, payload["default_locale"])
+    data = locales[locale]
+    return Catalog(locale, data["sections"], data["ui"])
+
+
+if __name__ == "__main__":
+    # python3 -m cuerd_settings.catalog [carpeta_del_catálogo]
+    print(f"Catálogo compilado: {compile_catalog(*sys.argv[1:2])}")
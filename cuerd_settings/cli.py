@@ -0,0 +1,134 @@
+import argparse
+import json
+import os
+import sys
+
+from cuerd_settings.catalog import applies_to_session, load_catalog
+from cuerd_settings.command_index import CommandIndex
+from cuerd_settings.config_files import CONFIG_SECTION, merge_file_entries
+from cuerd_settings.icon_cache import IconCache
+from cuerd_settings.launch_spec import compile_command
+from cuerd_settings.prefs import PreferencesStore
+from cuerd_settings.telemetry import LaunchTelemetry
+
+EXIT_UNKNOWN_ENTRY = 2
+EXIT_NOT_FOUND = 127
+EXIT_BROKEN_PIPE = 1
+
+
+def collect_entries(catalog, prefs, display_server=None):
+    """(sección, entrada) visibles, con el mismo criterio que la ventana"""
+    display_server = (display_server or os.getenv("XDG_SESSION_TYPE", "X11")).lower()
+    discovered = {}
+    if prefs.discover_applications():
+        from cuerd_settings.desktop_index import DesktopIndex, remove_duplicates
+
+        discovered = remove_duplicates(
+            DesktopIndex().load().entries(catalog.locale),
+            [entry["command"] for entry in catalog.entries()],
+        )
+
+    for section in catalog.sections:
+        entries = section["entries"] + discovered.get(section["id"], [])
+        overrides = prefs.get("config_files", []) if section["id"] == CONFIG_SECTION else ()
+        for entry in merge_file_entries(entries, overrides):
+            if not applies_to_session(entry, display_server):
+                continue
+            # Sin ventana no hay prisa: los archivos se comprueban aquí mismo
+            if entry.get("path") and not os.path.isfile(entry["path"]):
+                continue
+            yield section, entry
+
+
+def _icon_cache(prefs):
+    # Rutas de archivo (no resource://) para que rofi y similares puedan leerlas
+    icon_cache = IconCache(use_bundles=False)
+    pack = prefs.get("icon_pack")
+    if not os.path.isdir(icon_cache.pack_dir(pack)):
+        from cuerd_settings.icon_packs import discover_packs
+
+        icon_cache.register_packs(discover_packs())
+    return icon_cache, pack
+
+
+def list_entries(catalog, prefs, as_json=False, out=sys.stdout):
+    entries = list(collect_entries(catalog, prefs))
+    missing = CommandIndex().resolve([entry["command"] for _, entry in entries])
+    if not as_json:
+        for section, entry in entries:
+            mark = "" if not missing.get(entry["command"]) else " *"
+            out.write(f"{entry['id']}\t{entry['label']}{mark}\t{section['title']}\n")
+        return 0
+
+    icon_cache, pack = _icon_cache(prefs)
+    items = []
+    for section, entry in entries:
+        themed = bool(entry.get("themed_icon"))
+        items.append({
+            "id": entry["id"],
+            "label": entry["label"],
+            "section": section["id"],
+            "section_title": section["title"],
+            "command": entry["command"],
+            "available": not missing.get(entry["command"]),
+            "missing": missing.get(entry["command"], []),
+            "icon": entry["icon"],
+            # Los iconos del tema (entradas .desktop) se dejan por nombre
+            "icon_path": None if themed else icon_cache.find_path(pack, entry["icon"]),
+            "path": entry.get("path"),
+        })
+    json.dump(items, out, ensure_ascii=False, indent=2)
+    out.write("\n")
+    return 0
+
+
+def launch_entry(catalog, prefs, entry_id):
+    """Lanzar la herramienta en su propia sesión y volver de inmediato"""
+    import subprocess
+
+    for _, entry in collect_entries(catalog, prefs):
+        if entry["id"] == entry_id:
+            break
+    else:
+        print(f"Entrada desconocida: {entry_id} (ver --list)", file=sys.stderr)
+        return EXIT_UNKNOWN_ENTRY
+
+    spec = compile_command(entry["command"])
+    env = {**os.environ, **spec.env} if spec.env else None
+    telemetry = LaunchTelemetry()
+    telemetry.start(entry["command"], entry["id"])
+    try:
+        subprocess.Popen(spec.argv, env=env, start_new_session=True,
+                         stdin=subprocess.DEVNULL, close_fds=True)
+    except OSError as e:
+        telemetry.discard(entry["command"])
+        print(f"No se pudo ejecutar {entry['command']}: {e}", file=sys.stderr)
+        return EXIT_NOT_FOUND
+    # Sin bucle principal no se espera a la salida: se registra solo el lanzamiento
+    telemetry.spawned(entry["command"])
+    telemetry.shutdown()
+    return 0
+
+
+def run(argv):
+    """settings.py --list [--json] | --launch <id>"""
+    parser = argparse.ArgumentParser(prog="settings.py")
+    group = parser.add_mutually_exclusive_group(required=True)
+    group.add_argument("--list", action="store_true", help="mostrar las entradas del catálogo")
+    group.add_argument("--launch", metavar="ID", help="lanzar una entrada por su identificador")
+    parser.add_argument("--json", action="store_true", help="con --list: JSON con disponibilidad e iconos")
+    args = parser.parse_args(argv)
+
+    catalog = load_catalog()
+    prefs = PreferencesStore()
+    if args.launch:
+        return launch_entry(catalog, prefs, args.launch)
+    try:
+        result = list_entries(catalog, prefs, as_json=args.json)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Lector cerrado antes de tiempo (settings.py --list | head): salir sin traza;
+        # stdout pasa a /dev/null para que el vaciado al salir no vuelva a fallar
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return EXIT_BROKEN_PIPE
+    return result
@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+
+from cuerd_settings import xdg
+from cuerd_settings.launch_spec import compile_command
+
+CACHE_FILE = "commands.json"
+
+# Versión del análisis de los comandos: al cambiarla se descartan los resultados guardados
+CACHE_VERSION = 2
+
+def command_programs(command):
+    """Programas que deben existir para poder lanzar el comando (los del LaunchSpec)"""
+    return list(compile_command(command).programs)
+
+
+def _path_dirs():
+    return [d for d in os.environ.get("PATH", os.defpath).split(os.pathsep) if d]
+
+
+def _is_executable(path):
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def find_program(program, path_dirs=None):
+    if "/" in program:
+        path = os.path.expanduser(program)
+        return path if _is_executable(path) else None
+    for directory in path_dirs if path_dirs is not None else _path_dirs():
+        path = os.path.join(directory, program)
+        if _is_executable(path):
+            return path
+    return None
+
+
+class CommandIndex:
+    """Disponibilidad de los comandos del catálogo, cacheada en disco.
+
+    La caché se invalida cuando cambia el PATH o la fecha de modificación de
+    alguno de sus directorios (o de los directorios de las rutas absolutas).
+    """
+
+    def __init__(self, cache_path=None):
+        self.cache_path = cache_path or xdg.app_cache_file(CACHE_FILE)
+        # comando -> lista de programas que faltan (vacía si está disponible)
+        self.missing = {}
+
+    def _signature(self, commands):
+        dirs = _path_dirs()
+        for command in commands:
+            for program in command_programs(command):
+                if "/" in program:
+                    dirs.append(os.path.dirname(os.path.expanduser(program)))
+        signature = []
+        for directory in dict.fromkeys(dirs):
+            try:
+                signature.append([directory, os.stat(directory).st_mtime_ns])
+            except OSError:
+                signature.append([directory, None])
+        return signature
+
+    def _load_cache(self, signature):
+        try:
+            with open(self.cache_path) as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != CACHE_VERSION or data.get("signature") != signature:
+            return {}
+        return data.get("commands", {})
+
+    def resolve(self, commands):
+        """Resolver todos los comandos (llamar fuera del hilo principal).
+
+        Devuelve un diccionario comando -> programas que faltan.
+        """
+        signature = self._signature(commands)
+        cached = self._load_cache(signature)
+        path_dirs = _path_dirs()
+
+        results = {}
+        for command in commands:
+            if command in cached:
+                results[command] = cached[command]
+                continue
+            results[command] = [p for p in command_programs(command) if find_program(p, path_dirs) is None]
+
+        if any(command not in cached for command in commands):
+            data = {"version": CACHE_VERSION, "signature": signature, "commands": {**cached, **results}}
+            try:
+                xdg.write_atomic(self.cache_path, json.dumps(data))
+            except OSError as e:
+                print(f"No se pudo guardar la caché de comandos: {e}")
+
+        self.missing.update(results)
+        return results
+
+    def is_available(self, command):
+        return not self.missing.get(command)
+
+    def resolve_in_background(self, commands, callback):
+        """Resolver en un hilo y entregar el resultado en el bucle principal"""
+        from gi.repository import GLib
+
+        def worker():
+            results = self.resolve(list(commands))
+            GLib.idle_add(callback, results)
+
+        threading.Thread(target=worker, name="command-index", daemon=True).start()
@@ -0,0 +1,152 @@
+import os
+import shlex
+import threading
+
+from cuerd_settings import xdg
+
+# Sección del catálogo a la que se añaden los archivos propios del usuario
+CONFIG_SECTION = "config-files"
+
+# Icono de los archivos añadidos en las preferencias
+DEFAULT_ICON = "text-editor"
+
+# Tiempo que se agrupan los avisos de los monitores antes de volver a comprobar
+DEBOUNCE_MS = 300
+
+
+def expand_path(path):
+    """{config} es $XDG_CONFIG_HOME; también se expanden ~ y $VARIABLES"""
+    path = path.replace("{config}", xdg.config_home())
+    return os.path.abspath(os.path.expandvars(os.path.expanduser(path)))
+
+
+def resolve_entries(entries, overrides=()):
+    """Aplicar las preferencias del usuario a las entradas de archivos.
+
+    Cada elemento de ``overrides`` (preferencia "config_files") es un
+    diccionario con "path" y opcionalmente "id", "label", "icon" o
+    "hidden": con el "id" de una entrada del catálogo la modifica u oculta;
+    sin él añade un archivo nuevo a la sección.
+    """
+    resolved = {entry["id"]: dict(entry) for entry in entries}
+    for override in overrides:
+        if not isinstance(override, dict) or not (override.get("path") or override.get("id")):
+            continue
+        entry_id = override.get("id") or f"user:{override['path']}"
+        if override.get("hidden"):
+            resolved.pop(entry_id, None)
+            continue
+        entry = resolved.setdefault(entry_id, {
+            "id": entry_id,
+            "label": os.path.basename(override.get("path", entry_id)),
+            "icon": DEFAULT_ICON,
+            "session": None,
+            "section": CONFIG_SECTION,
+        })
+        entry.update((key, override[key]) for key in ("label", "icon", "path") if key in override)
+
+    for entry in resolved.values():
+        if entry.get("path"):
+            entry["path"] = expand_path(entry["path"])
+            entry["command"] = f"xdg-open {shlex.quote(entry['path'])}"
+    return [entry for entry in resolved.values() if entry.get("path")]
+
+
+def merge_file_entries(entries, overrides=()):
+    """Resolver las entradas con "path" sin cambiar el orden de la sección"""
+    files = {entry["id"]: entry for entry in resolve_entries([e for e in entries if e.get("path")], overrides)}
+    merged = [files.pop(entry["id"], None) if entry.get("path") else entry for entry in entries]
+    # Las añadidas en las preferencias van al final
+    return [entry for entry in merged if entry is not None] + list(files.values())
+
+
+def _stat_paths(paths):
+    # {ruta: (tamaño, fecha)} de los archivos que existen
+    found = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if not os.path.isdir(path):
+            found[path] = (st.st_size, st.st_mtime)
+    return found
+
+
+class ConfigFileWatcher:
+    """Existencia, tamaño y fecha de los archivos de configuración.
+
+    Las comprobaciones se hacen en un hilo y el resultado se entrega en el
+    bucle principal, de modo que construir la ventana no toca el disco.
+    Después se vigilan las carpetas que contienen los archivos (y
+    $XDG_CONFIG_HOME, para las carpetas que se creen más tarde) y solo se
+    vuelven a comprobar las rutas afectadas por cada cambio.
+    """
+
+    def __init__(self, callback, debounce_ms=DEBOUNCE_MS):
+        self.callback = callback
+        self.debounce_ms = debounce_ms
+        self.paths = set()
+        self.found = {}
+        self._monitors = {}
+        self._dirty = set()
+        self._rescan_id = None
+
+    def scan(self, entries):
+        """Comprobar en segundo plano las rutas de las entradas"""
+        self.paths = {entry["path"] for entry in entries}
+        self._scan_in_background(set(self.paths), full=True)
+
+    def _scan_in_background(self, paths, full=False):
+        from gi.repository import GLib
+
+        def worker():
+            # Carpetas que existen: GLib sondea periódicamente las que faltan
+            parents = {os.path.dirname(path) for path in paths} | {xdg.config_home()}
+            parents = {directory for directory in parents if os.path.isdir(directory)}
+            GLib.idle_add(self._deliver, paths, _stat_paths(paths), parents, full)
+
+        threading.Thread(target=worker, name="config-files", daemon=True).start()
+
+    def _deliver(self, paths, found, parents, full):
+        if full:
+            self.found = {}
+        for path in paths:
+            self.found.pop(path, None)
+        self.found.update((path, info) for path, info in found.items() if path in self.paths)
+        self._watch(parents)
+        self.callback(self.found)
+        return False
+
+    def info(self, path):
+        """(tamaño, fecha) si el archivo existe, o None"""
+        return self.found.get(path)
+
+    def _watch(self, directories):
+        from gi.repository import Gio
+
+        for directory in directories - set(self._monitors):
+            monitor = Gio.File.new_for_path(directory).monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            monitor.connect("changed", self._on_changed)
+            self._monitors[directory] = monitor
+
+    def _on_changed(self, monitor, file, other_file, event_type):  # pylint: disable=unused-argument
+        from gi.repository import GLib
+
+        for changed in (file, other_file):
+            if changed is None:
+                continue
+            changed_path = changed.get_path()
+            # El propio archivo o una carpeta que lo contiene (creada o borrada)
+            self._dirty.update(
+                path for path in self.paths
+                if path == changed_path or path.startswith(changed_path + os.sep)
+            )
+        if self._dirty and self._rescan_id is None:
+            self._rescan_id = GLib.timeout_add(self.debounce_ms, self._on_rescan_timeout)
+
+    def _on_rescan_timeout(self):
+        self._rescan_id = None
+        dirty, self._dirty = self._dirty, set()
+        self._scan_in_background(dirty)
+        return False
@@ -0,0 +1,386 @@
+import json
+import os
+
+from cuerd_settings import xdg
+from cuerd_settings.command_index import command_programs
+
+INDEX_FILE = "desktop_index.json"
+
+# Versión del formato del índice: al cambiarla se vuelven a analizar los archivos
+INDEX_VERSION = 2
+
+# Solo se incorporan las entradas de configuración o de sistema
+DISCOVER_CATEGORIES = {"Settings", "System"}
+
+# Categoría de freedesktop.org -> sección del catálogo (la primera que coincida)
+CATEGORY_SECTIONS = (
+    ("Accessibility", "accessibility"),
+    ("HardwareSettings", "hardware"),
+    ("Printing", "hardware"),
+    ("Network", "network"),
+    ("Dialup", "network"),
+    ("DesktopSettings", "appearance"),
+    ("PackageManager", "system"),
+    ("Security", "system"),
+)
+DEFAULT_SECTION = "system"
+
+# Terminal con la que se abren las entradas con Terminal=true
+TERMINAL_PREFIX = "sakura -e "
+
+# Icono del tema para las entradas que no indican ninguno
+FALLBACK_ICON = "application-x-executable"
+
+# Tiempo que se agrupan los cambios de las carpetas antes de avisar
+DEBOUNCE_MS = 500
+
+
+def application_dirs():
+    """Carpetas applications/ de los directorios XDG (la del usuario primero)"""
+    return [os.path.join(data_dir, "applications") for data_dir in xdg.data_dirs()]
+
+
+def _unescape(value):
+    return (value.replace("\\s", " ").replace("\\n", "\n").replace("\\t", "\t")
+            .replace("\\r", "\r").replace("\\\\", "\\"))
+
+
+def _strip_field_codes(exec_line):
+    # %f, %U, %i... no tienen sentido al lanzar sin archivos; %% es un "%"
+    words = []
+    for word in exec_line.split(" "):
+        if len(word) == 2 and word[0] == "%" and word[1] != "%":
+            continue
+        words.append(word.replace("%%", "%"))
+    return " ".join(word for word in words if word)
+
+
+def read_desktop_group(path):
+    """Claves del grupo [Desktop Entry] y nombres por idioma; None si no se puede leer"""
+    fields = {}
+    names = {}
+    in_group = False
+    try:
+        with open(path, encoding="utf-8", errors="replace") as desktop_file:
+            for line in desktop_file:
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                if line.startswith("["):
+                    # Las acciones y otros grupos vienen después; no interesan
+                    if in_group:
+                        break
+                    in_group = line == "[Desktop Entry]"
+                    continue
+                if not in_group or "=" not in line:
+                    continue
+                key, value = (part.strip() for part in line.split("=", 1))
+                if key == "Name":
+                    names[""] = _unescape(value)
+                elif key.startswith("Name["):
+                    names[key[5:-1]] = _unescape(value)
+                else:
+                    fields[key] = value
+    except OSError:
+        return None
+    return fields, names
+
+
+def parse_desktop_file(path):
+    """Leer el grupo [Desktop Entry]; None si no debe mostrarse"""
+    group = read_desktop_group(path)
+    if group is None:
+        return None
+    fields, names = group
+    if fields.get("Type") != "Application" or "" not in names or "Exec" not in fields:
+        return None
+    if fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+        return None
+    categories = [c for c in fields.get("Categories", "").split(";") if c]
+    if not DISCOVER_CATEGORIES.intersection(categories):
+        return None
+
+    command = _strip_field_codes(fields["Exec"])
+    if not command:
+        return None
+    if fields.get("Terminal") == "true":
+        command = TERMINAL_PREFIX + command
+    return {
+        "names": names,
+        "command": command,
+        "icon": _unescape(fields.get("Icon", "")) or FALLBACK_ICON,
+        "categories": categories,
+        "only_show_in": [d for d in fields.get("OnlyShowIn", "").split(";") if d],
+        "not_show_in": [d for d in fields.get("NotShowIn", "").split(";") if d],
+    }
+
+
+def section_for(categories):
+    for category, section_id in CATEGORY_SECTIONS:
+        if category in categories:
+            return section_id
+    return DEFAULT_SECTION
+
+
+def current_desktops(desktop=None):
+    """Escritorios de $XDG_CURRENT_DESKTOP (p. ej. {"XFCE"})"""
+    return set((desktop or os.environ.get("XDG_CURRENT_DESKTOP", "")).split(":")) - {""}
+
+
+def localized_name(names, locale):
+    return names.get(locale) or names.get(locale.split("_")[0]) or names[""]
+
+
+class DesktopIndex:
+    """Entradas .desktop de configuración, indexadas en disco.
+
+    Para cada carpeta applications/ se guarda la fecha de modificación de ella
+    y de sus subcarpetas, y la de cada archivo con su resultado ya analizado.
+    Al arrancar solo se hace stat de las carpetas y archivos conocidos y se
+    recorren de nuevo las carpetas si el mtime de alguna cambió; únicamente los
+    archivos nuevos o modificados se vuelven a analizar. Con ``watch()`` los
+    cambios posteriores, también en las subcarpetas, actualizan el índice
+    archivo a archivo.
+    """
+
+    def __init__(self, dirs=None, index_path=None, debounce_ms=DEBOUNCE_MS, parse=parse_desktop_file):
+        self.dirs = dirs if dirs is not None else application_dirs()
+        self.index_path = index_path or xdg.app_cache_file(INDEX_FILE)
+        # Función que convierte un archivo en la entrada guardada en el índice
+        self.parse = parse
+        self.debounce_ms = debounce_ms
+        self.index = {}
+        self.parsed = 0
+        self._monitors = {}
+        self._dirty = set()
+        self._changed_id = None
+        self._callback = None
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as index_file:
+                data = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        return data.get("dirs", {})
+
+    def _save_index(self):
+        try:
+            xdg.write_atomic(self.index_path, json.dumps({"version": INDEX_VERSION, "dirs": self.index}))
+        except OSError as e:
+            print(f"No se pudo guardar el índice de aplicaciones: {e}")
+
+    def _scan_names(self, directory, start=""):
+        # Rutas relativas de los .desktop y mtime de cada carpeta recorrida,
+        # incluidas las subcarpetas (kde4/...); "" es la propia carpeta
+        names = []
+        subdirs = {}
+        pending = [start]
+        while pending:
+            relative = pending.pop()
+            path = os.path.join(directory, relative)
+            try:
+                subdirs[relative] = os.stat(path).st_mtime_ns
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        name = os.path.join(relative, entry.name)
+                        if entry.is_dir():
+                            pending.append(name)
+                        elif entry.name.endswith(".desktop"):
+                            names.append(name)
+            except OSError:
+                subdirs.pop(relative, None)
+                continue
+        return names, subdirs
+
+    @staticmethod
+    def _subdirs_unchanged(directory, subdirs):
+        # Un archivo nuevo en kde4/ solo cambia el mtime de kde4/, no el de la raíz
+        for relative, mtime in subdirs.items():
+            try:
+                if os.stat(os.path.join(directory, relative)).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _update_file(self, files, directory, name, previous=None):
+        path = os.path.join(directory, name)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            files.pop(name, None)
+            return previous is not None
+        if previous is not None and previous["mtime"] == mtime:
+            files[name] = previous
+            return False
+        files[name] = {"mtime": mtime, "entry": self.parse(path)}
+        self.parsed += 1
+        return True
+
+    def load(self):
+        """Actualizar el índice con lo que haya cambiado en disco"""
+        cached = self._load_index()
+        changed = False
+        self.index = {}
+        for directory in self.dirs:
+            previous = cached.get(directory, {})
+            previous_files = previous.get("files", {})
+            subdirs = previous.get("subdirs")
+            if subdirs and self._subdirs_unchanged(directory, subdirs):
+                names = list(previous_files)
+            else:
+                names, subdirs = self._scan_names(directory)
+                changed = True
+            if "" not in subdirs:
+                # La carpeta no existe
+                continue
+            files = {}
+            for name in names:
+                changed |= self._update_file(files, directory, name, previous_files.get(name))
+            self.index[directory] = {"subdirs": subdirs, "files": files}
+
+        if changed or set(cached) != set(self.index):
+            self._save_index()
+        return self
+
+    def files(self):
+        """(identificador, entrada) de cada .desktop válido, sin los ocultos por otra carpeta"""
+        seen = set()
+        for directory in self.dirs:
+            files = self.index.get(directory, {}).get("files", {})
+            for name in sorted(files):
+                # El identificador de la entrada: kde4/foo.desktop -> kde4-foo.desktop
+                desktop_id = name.replace(os.sep, "-")
+                # Las carpetas de mayor prioridad ocultan a las siguientes
+                if desktop_id in seen:
+                    continue
+                seen.add(desktop_id)
+                if files[name]["entry"] is not None:
+                    yield desktop_id, files[name]["entry"]
+
+    def entries(self, locale, desktop=None):
+        """Devolver {sección: [entradas]} con el formato de las del catálogo"""
+        desktops = current_desktops(desktop)
+        sections = {}
+        for desktop_id, entry in self.files():
+            if entry["only_show_in"] and not desktops.intersection(entry["only_show_in"]):
+                continue
+            if desktops.intersection(entry["not_show_in"]):
+                continue
+            section_id = section_for(entry["categories"])
+            sections.setdefault(section_id, []).append({
+                "id": f"desktop:{desktop_id}",
+                "label": localized_name(entry["names"], locale),
+                "command": entry["command"],
+                "icon": entry["icon"],
+                "themed_icon": True,
+                "session": None,
+                "section": section_id,
+            })
+        for section_entries in sections.values():
+            section_entries.sort(key=lambda e: e["label"].lower())
+        return sections
+
+    def watch(self, callback):
+        """Vigilar las carpetas y llamar a callback() tras actualizar el índice"""
+        self._callback = callback
+        for directory, info in self.index.items():
+            self._watch(directory, info["subdirs"])
+
+    def _watch(self, directory, subdirs):
+        from gi.repository import Gio
+
+        # Un monitor por carpeta: Gio no vigila las subcarpetas por su cuenta
+        for relative in subdirs:
+            if (directory, relative) in self._monitors:
+                continue
+            path = os.path.join(directory, relative)
+            monitor = Gio.File.new_for_path(path).monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+            monitor.connect("changed", self._on_dir_changed, directory, relative)
+            self._monitors[(directory, relative)] = monitor
+
+    def _on_dir_changed(self, monitor, file, other_file, event_type, directory, relative):  # pylint: disable=unused-argument
+        from gi.repository import GLib
+
+        subdirs = self.index[directory]["subdirs"]
+        for changed_file in (file, other_file):
+            if changed_file is None:
+                continue
+            # Ruta relativa a la carpeta vigilada, como en el índice (kde4/foo.desktop)
+            name = os.path.join(relative, changed_file.get_basename())
+            if name.endswith(".desktop") or name in subdirs or os.path.isdir(changed_file.get_path()):
+                self._dirty.add((directory, name))
+        # Las instalaciones de paquetes tocan muchos archivos seguidos
+        if self._dirty and self._changed_id is None:
+            self._changed_id = GLib.timeout_add(self.debounce_ms, self._on_changed_timeout)
+
+    def _on_changed_timeout(self):
+        self._changed_id = None
+        dirty, self._dirty = self._dirty, set()
+        changed = False
+        for directory, name in dirty:
+            info = self.index.get(directory)
+            if info is None:
+                continue
+            if name.endswith(".desktop"):
+                changed |= self._update_file(info["files"], directory, name, info["files"].get(name))
+            else:
+                changed |= self._update_subdir(info, directory, name)
+            parent = os.path.dirname(name)
+            if parent in info["subdirs"]:
+                try:
+                    info["subdirs"][parent] = os.stat(os.path.join(directory, parent)).st_mtime_ns
+                except OSError:
+                    pass
+        if changed:
+            self._save_index()
+            if self._callback is not None:
+                self._callback()
+        return False
+
+    def _update_subdir(self, info, directory, relative):
+        # Subcarpeta creada, borrada o movida: volver a recorrer solo esa rama
+        prefix = relative + os.sep
+        files = info["files"]
+        names, subdirs = self._scan_names(directory, relative)
+        changed = False
+        for name in set(files) - set(names):
+            if name.startswith(prefix):
+                del files[name]
+                changed = True
+        for stale in set(info["subdirs"]) - set(subdirs):
+            if stale == relative or stale.startswith(prefix):
+                del info["subdirs"][stale]
+                monitor = self._monitors.pop((directory, stale), None)
+                if monitor is not None:
+                    monitor.cancel()
+        for name in names:
+            changed |= self._update_file(files, directory, name, files.get(name))
+        info["subdirs"].update(subdirs)
+        self._watch(directory, subdirs)
+        return changed
+
+
+def launched_program(command):
+    """Programa real que lanza el comando, sin envoltorios (env, sakura -e, pkexec...)"""
+    programs = command_programs(command)
+    return os.path.basename(programs[-1]) if programs else None
+
+
+def known_programs(commands):
+    """Programas que ya lanza el catálogo, para no duplicar sus entradas"""
+    return {launched_program(command) for command in commands} - {None}
+
+
+def remove_duplicates(sections, commands):
+    programs = known_programs(commands)
+    return {
+        section_id: [
+            entry for entry in entries
+            if launched_program(entry["command"]) not in programs
+        ]
+        for section_id, entries in sections.items()
+    }
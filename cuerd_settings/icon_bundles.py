@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import sys
+
+from cuerd_settings.icon_cache import ICON_EXTENSIONS, RESOURCE_SCHEME
+
+# ico/<paquete>.gresource junto a la carpeta del paquete
+BUNDLE_SUFFIX = ".gresource"
+RESOURCE_PREFIX = "/org/cuerdos/Settings/ico"
+INDEX_NAME = "index.json"
+
+
+def bundle_path(pack_dir):
+    return pack_dir.rstrip(os.sep) + BUNDLE_SUFFIX
+
+
+def _pack_index(pack_dir):
+    # Nombre del icono -> archivo, con la misma preferencia que la búsqueda (.svg, .png)
+    files = {}
+    with os.scandir(pack_dir) as entries:
+        for entry in entries:
+            name, ext = os.path.splitext(entry.name)
+            if ext in ICON_EXTENSIONS and entry.is_file():
+                current = files.get(name)
+                if current is None or ICON_EXTENSIONS.index(ext) < ICON_EXTENSIONS.index(os.path.splitext(current)[1]):
+                    files[name] = entry.name
+    return files
+
+
+def pack_signature(pack_dir):
+    """Resumen del tamaño y la fecha de cada icono de la carpeta.
+
+    Copiar un icono encima de otro no cambia la fecha de la carpeta, pero sí
+    la del archivo.
+    """
+    digest = hashlib.sha1()
+    with os.scandir(pack_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if os.path.splitext(entry.name)[1] in ICON_EXTENSIONS and entry.is_file():
+                stat = entry.stat()
+                digest.update(f"{entry.name}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def compile_pack(pack_dir, output=None):
+    """Compilar un paquete de iconos en un único GResource (en la instalación)"""
+    # Solo en la instalación: abrir un paquete al arrancar no debe cargar estos módulos
+    import subprocess
+    import tempfile
+    from xml.sax.saxutils import escape, quoteattr
+
+    pack_dir = os.path.abspath(pack_dir)
+    pack = os.path.basename(pack_dir.rstrip(os.sep))
+    output = output or bundle_path(pack_dir)
+    files = _pack_index(pack_dir)
+    index = {"signature": pack_signature(pack_dir), "icons": files}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with open(os.path.join(tmp_dir, INDEX_NAME), "w") as index_file:
+            json.dump(index, index_file)
+        lines = [f"<gresources><gresource prefix={quoteattr(f'{RESOURCE_PREFIX}/{pack}')}>"]
+        lines.append(f"<file>{INDEX_NAME}</file>")
+        lines.extend(f"<file>{escape(name)}</file>" for name in sorted(set(files.values())))
+        lines.append("</gresource></gresources>")
+        xml_path = os.path.join(tmp_dir, "icons.gresource.xml")
+        with open(xml_path, "w") as xml_file:
+            xml_file.write("\n".join(lines))
+        # Se escribe en un temporal y se renombra: la aplicación puede tenerlo mapeado
+        tmp_output = f"{output}.{os.getpid()}.tmp"
+        subprocess.run(
+            ["glib-compile-resources", f"--sourcedir={tmp_dir}", f"--sourcedir={pack_dir}",
+             f"--target={tmp_output}", xml_path],
+            check=True,
+        )
+        os.replace(tmp_output, output)
+    return output
+
+
+def compile_packs(ico_dir):
+    import shutil
+
+    if shutil.which("glib-compile-resources") is None:
+        raise OSError("glib-compile-resources no está instalado (libglib2.0-bin)")
+    outputs = []
+    with os.scandir(ico_dir) as entries:
+        for entry in sorted(entries, key=lambda e: e.name):
+            if entry.is_dir() and _pack_index(entry.path):
+                outputs.append(compile_pack(entry.path))
+    return outputs
+
+
+class IconBundle:
+    """Paquete de iconos compilado: un solo archivo mapeado en memoria.
+
+    ``Gio.Resource.load`` mapea el archivo y el índice incluido resuelve cada
+    nombre sin ``open``. Si la carpeta del paquete existe y el tamaño o la
+    fecha de alguno de sus iconos no coincide con lo guardado al compilar
+    (``pack_signature``), el paquete se considera desactualizado y se usan los
+    archivos sueltos.
+    """
+
+    def __init__(self, pack, resource, index):
+        self.pack = pack
+        self.resource = resource
+        self.icons = index["icons"]
+        self.prefix = f"{RESOURCE_PREFIX}/{pack}"
+
+    @classmethod
+    def open(cls, pack_dir):
+        """Devolver el paquete compilado de pack_dir, o None si no hay uno válido"""
+        path = bundle_path(pack_dir)
+        if not os.path.exists(path):
+            return None
+        from gi.repository import Gio, GLib
+
+        pack = os.path.basename(pack_dir.rstrip(os.sep))
+        try:
+            resource = Gio.Resource.load(path)
+            data = resource.lookup_data(f"{RESOURCE_PREFIX}/{pack}/{INDEX_NAME}", Gio.ResourceLookupFlags.NONE)
+            index = json.loads(data.get_data())
+        except (GLib.Error, ValueError) as e:
+            print(f"Paquete de iconos compilado no válido, se usan los archivos: {path} ({e})")
+            return None
+
+        try:
+            signature = pack_signature(pack_dir)
+        except OSError:
+            # Instalación solo con el paquete compilado
+            signature = None
+        if signature is not None and signature != index.get("signature"):
+            print(f"Paquete de iconos compilado desactualizado, se usan los archivos: {path}")
+            return None
+
+        Gio.resources_register(resource)
+        return cls(pack, resource, index)
+
+    def find(self, name):
+        """URI resource:// del icono, o None si el paquete no lo tiene"""
+        file_name = self.icons.get(name)
+        if file_name is None:
+            return None
+        return f"{RESOURCE_SCHEME}{self.prefix}/{file_name}"
+
+
+if __name__ == "__main__":
+    # python3 -m cuerd_settings.icon_bundles [carpeta ico/]
+    from cuerd_settings.catalog import APP_DIR
+
+    for bundle in compile_packs(sys.argv[1] if len(sys.argv) > 1 else os.path.join(APP_DIR, "ico")):
+        print(f"Paquete de iconos compilado: {bundle}")
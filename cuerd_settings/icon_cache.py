@@ -0,0 +1,178 @@
+import os
+from collections import OrderedDict
+
+from cuerd_settings.catalog import APP_DIR
+from cuerd_settings.startup_trace import tracer
+
+# Carpeta de la aplicación (la instalada o la del repositorio), como la del catálogo
+ICON_ROOT = APP_DIR
+ICON_EXTENSIONS = (".svg", ".png")
+
+# Prefijo de las rutas de iconos servidos desde un paquete compilado
+RESOURCE_SCHEME = "resource://"
+
+# Presupuesto por defecto para los pixbufs decodificados (4 MiB)
+DEFAULT_BUDGET = 4 * 1024 * 1024
+
+
+def pixbuf_size(pixbuf):
+    """Calcular los bytes que ocupa un pixbuf decodificado"""
+    try:
+        return pixbuf.get_byte_length()
+    except AttributeError:
+        return pixbuf.get_rowstride() * pixbuf.get_height()
+
+
+def decode_icon(path, size):
+    """Decodificar el icono (archivo o resource://) al tamaño pedido; se puede llamar desde otro hilo"""
+    from gi.repository import GdkPixbuf
+
+    if path.startswith(RESOURCE_SCHEME):
+        return GdkPixbuf.Pixbuf.new_from_resource_at_scale(path[len(RESOURCE_SCHEME):], size, size, True)
+    return GdkPixbuf.Pixbuf.new_from_file_at_size(path, size, size)
+
+
+class IconCache:
+    """Caché LRU de iconos decodificados indexada por (paquete, nombre, tamaño).
+
+    El paquete ``None`` corresponde a la carpeta ``icons`` de la aplicación
+    (icono de la ventana y logo de "Acerca de...").
+    """
+
+    def __init__(self, root=ICON_ROOT, budget=DEFAULT_BUDGET, use_bundles=True):
+        self.root = root
+        self.budget = budget
+        # Sin paquetes compilados (línea de comandos: rutas de archivo y sin GTK)
+        self.use_bundles = use_bundles
+        self.bytes_held = 0
+        self.hits = 0
+        self.misses = 0
+        self._pixbufs = OrderedDict()
+        self._paths = {}
+        # Paquetes encontrados fuera de la carpeta de la aplicación
+        self._pack_dirs = {}
+        # Paquetes compilados (GResource) ya abiertos, o None si no hay
+        self._bundles = {}
+
+    def register_packs(self, packs):
+        """Registrar las carpetas de los paquetes descubiertos ({nombre: carpeta})"""
+        for pack, path in packs.items():
+            if self._pack_dirs.get(pack) != path:
+                self._pack_dirs[pack] = path
+                self._bundles.pop(pack, None)
+                for key in [key for key in self._paths if key[0] == pack]:
+                    del self._paths[key]
+
+    def pack_dir(self, pack):
+        if pack is None:
+            return os.path.join(self.root, "icons")
+        return self._pack_dirs.get(pack) or os.path.join(self.root, "ico", pack)
+
+    def bundle(self, pack):
+        """Paquete compilado del paquete de iconos, abierto la primera vez"""
+        if pack is None or not self.use_bundles:
+            return None
+        if pack not in self._bundles:
+            from cuerd_settings.icon_bundles import IconBundle
+
+            with tracer.span(f"abrir paquete {pack}", "icon"):
+                self._bundles[pack] = IconBundle.open(self.pack_dir(pack))
+        return self._bundles[pack]
+
+    def find_path(self, pack, name):
+        """Buscar el icono (.svg o .png) una sola vez por paquete.
+
+        Con un paquete compilado se devuelve una URI ``resource://`` sacada de
+        su índice; si no, la ruta del archivo suelto.
+        """
+        key = (pack, name)
+        if key in self._paths:
+            return self._paths[key]
+
+        bundle = self.bundle(pack)
+        if bundle is not None:
+            self._paths[key] = bundle.find(name)
+            return self._paths[key]
+
+        path = None
+        base_dir = self.pack_dir(pack)
+        for ext in ICON_EXTENSIONS:
+            candidate = os.path.join(base_dir, name + ext)
+            if os.path.exists(candidate):
+                path = candidate
+                break
+        # También se recuerdan los iconos que no existen
+        self._paths[key] = path
+        return path
+
+    def lookup(self, pack, name, size):
+        """Devolver el pixbuf si ya está decodificado, sin tocar el disco"""
+        key = (pack, name, size)
+        pixbuf = self._pixbufs.get(key)
+        if pixbuf is not None:
+            self._pixbufs.move_to_end(key)
+        return pixbuf
+
+    def get(self, pack, name, size):
+        """Devolver el pixbuf del icono, decodificándolo solo la primera vez"""
+        pixbuf = self.lookup(pack, name, size)
+        if pixbuf is not None:
+            self.hits += 1
+            return pixbuf
+
+        self.misses += 1
+        with tracer.span(f"buscar {name}", "icon", pack=pack):
+            path = self.find_path(pack, name)
+        if path is None:
+            print(f"Archivo de icono no encontrado: {name} ({pack})")
+            return None
+
+        from gi.repository import GLib
+        try:
+            with tracer.span(f"decodificar {name}@{size}", "icon", path=path):
+                pixbuf = decode_icon(path, size)
+        except GLib.Error as e:
+            print(f"No se pudo cargar el icono {path}: {e}")
+            return None
+
+        self.put(pack, name, size, pixbuf)
+        return pixbuf
+
+    def put(self, pack, name, size, pixbuf):
+        key = (pack, name, size)
+        old = self._pixbufs.pop(key, None)
+        if old is not None:
+            self.bytes_held -= pixbuf_size(old)
+        self._pixbufs[key] = pixbuf
+        self.bytes_held += pixbuf_size(pixbuf)
+        self._evict()
+
+    def _evict(self):
+        # Liberar los iconos menos usados hasta volver al presupuesto,
+        # conservando siempre el último insertado
+        while self.bytes_held > self.budget and len(self._pixbufs) > 1:
+            _, pixbuf = self._pixbufs.popitem(last=False)
+            self.bytes_held -= pixbuf_size(pixbuf)
+
+    def clear(self):
+        self._pixbufs.clear()
+        self.bytes_held = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._pixbufs),
+            "bytes": self.bytes_held,
+            "budget": self.budget,
+        }
+
+    def report(self):
+        stats = self.stats()
+        return (f"{stats['hits']} aciertos, {stats['misses']} fallos, "
+                f"{stats['entries']} iconos, {stats['bytes'] / 1024:.1f} KiB "
+                f"de {stats['budget'] / 1024:.0f} KiB")
+
+
+# Caché compartida por todas las ventanas del proceso
+icon_cache = IconCache()
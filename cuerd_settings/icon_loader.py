@@ -0,0 +1,125 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gi.repository import GdkPixbuf, GLib
+
+from cuerd_settings.icon_cache import decode_icon
+from cuerd_settings.startup_trace import tracer
+
+# Hilos de decodificación; más no aporta con unas decenas de iconos por paquete
+MAX_WORKERS = 4
+
+
+class IconLoader:
+    """Decodificación de iconos en un grupo de hilos.
+
+    ``request`` devuelve el pixbuf si ya está en la caché y, si no, un pixbuf
+    transparente del mismo tamaño mientras el icono se decodifica (la rasterización
+    de SVG con GdkPixbuf libera el GIL). Los iconos terminados se entregan en el
+    bucle principal por lotes, con una sola llamada ``idle_add`` para todos los que
+    hayan terminado entre dos iteraciones: ``on_loaded(target, key, pixbuf)``
+    por cada destino que esperaba el icono (``pixbuf`` es None si no se pudo leer).
+    Cuando ya no queda ninguno pendiente se llama a ``on_idle()``, si se indica.
+    La búsqueda del archivo y la caché se usan solo desde el hilo principal.
+    """
+
+    def __init__(self, cache, on_loaded, workers=None, on_idle=None):
+        self.cache = cache
+        self.on_loaded = on_loaded
+        self.on_idle = on_idle
+        self.workers = workers or min(MAX_WORKERS, os.cpu_count() or 1)
+        self._executor = None
+        self._waiting = {}
+        self._failed = set()
+        self._done = []
+        self._deliver_id = None
+        self._lock = threading.Lock()
+        self._placeholders = {}
+
+    def request(self, pack, name, size, target=None):
+        """Pixbuf del icono, el marcador si está pendiente o None si no existe"""
+        key = (pack, name, size)
+        pixbuf = self.cache.lookup(*key)
+        if pixbuf is not None:
+            self.cache.hits += 1
+            return pixbuf
+        if key in self._failed or not self._submit(key):
+            return None
+        if target is not None:
+            self._waiting[key].append(target)
+        return self.placeholder(size)
+
+    def prefetch(self, keys):
+        """Empezar a decodificar de una vez todos los iconos (paquete, nombre, tamaño)"""
+        for key in keys:
+            if key not in self._failed and self.cache.lookup(*key) is None:
+                self._submit(key)
+
+    def placeholder(self, size):
+        # Transparente y del tamaño final: la fila no cambia al llegar el icono
+        pixbuf = self._placeholders.get(size)
+        if pixbuf is None:
+            pixbuf = GdkPixbuf.Pixbuf.new(GdkPixbuf.Colorspace.RGB, True, 8, size, size)
+            pixbuf.fill(0)
+            self._placeholders[size] = pixbuf
+        return pixbuf
+
+    def busy(self):
+        return bool(self._waiting)
+
+    def _submit(self, key):
+        if key in self._waiting:
+            return True
+        pack, name, size = key
+        with tracer.span(f"buscar {name}", "icon", pack=pack):
+            path = self.cache.find_path(pack, name)
+        if path is None:
+            print(f"Archivo de icono no encontrado: {name} ({pack})")
+            self._failed.add(key)
+            return False
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="icons")
+        self.cache.misses += 1
+        self._waiting[key] = []
+        self._executor.submit(self._decode, key, path)
+        return True
+
+    def _decode(self, key, path):
+        # Hilo de trabajo: solo decodifica y deja el resultado en la lista compartida
+        _, name, size = key
+        try:
+            with tracer.span(f"decodificar {name}@{size}", "icon", path=path):
+                pixbuf = decode_icon(path, size)
+        except GLib.Error as e:
+            print(f"No se pudo cargar el icono {path}: {e}")
+            pixbuf = None
+        with self._lock:
+            self._done.append((key, pixbuf))
+            if self._deliver_id is None:
+                self._deliver_id = GLib.idle_add(self._deliver)
+
+    def _deliver(self):
+        with self._lock:
+            done, self._done = self._done, []
+            self._deliver_id = None
+        with tracer.span(f"entregar {len(done)} iconos", "icon"):
+            for key, pixbuf in done:
+                if pixbuf is None:
+                    self._failed.add(key)
+                else:
+                    self.cache.put(*key, pixbuf)
+                for target in self._waiting.pop(key, []):
+                    self.on_loaded(target, key, pixbuf)
+        if not self._waiting and self.on_idle is not None:
+            self.on_idle()
+        return False
+
+    def reset(self):
+        """Olvidar los fallos (p. ej. tras instalar o cambiar paquetes)"""
+        self._failed.clear()
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,98 @@
+import json
+import os
+
+from cuerd_settings import xdg
+from cuerd_settings.icon_cache import ICON_EXTENSIONS, ICON_ROOT
+
+MANIFEST_FILE = "icon_packs.json"
+
+
+def pack_roots(app_root=ICON_ROOT):
+    """Carpetas que pueden contener paquetes: la de la aplicación y las XDG"""
+    roots = [os.path.join(app_root, "ico")]
+    roots.extend(os.path.join(data_dir, xdg.APP_DIR, "ico") for data_dir in xdg.data_dirs())
+    unique = {}
+    for root in roots:
+        unique.setdefault(os.path.realpath(root), root)
+    return list(unique.values())
+
+
+def _has_icons(path):
+    # Basta con encontrar el primer icono; scandir evita un stat por archivo
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.endswith(ICON_EXTENSIONS):
+                    return True
+    except OSError:
+        pass
+    return False
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as manifest_file:
+            return json.load(manifest_file)
+    except (OSError, ValueError):
+        return {}
+
+
+def discover_packs(roots=None, manifest_path=None):
+    """Devolver {nombre: carpeta} de los paquetes de iconos disponibles.
+
+    El resultado de cada carpeta se guarda en un manifiesto indexado por la
+    fecha de modificación de la raíz y de cada paquete, de modo que solo se
+    vuelven a recorrer las carpetas que han cambiado.
+    """
+    roots = roots if roots is not None else pack_roots()
+    manifest_path = manifest_path or xdg.app_cache_file(MANIFEST_FILE)
+    manifest = _load_manifest(manifest_path)
+    new_manifest = {}
+    packs = {}
+    changed = False
+
+    for root in roots:
+        try:
+            root_mtime = os.stat(root).st_mtime_ns
+        except OSError:
+            continue
+
+        cached = manifest.get(root, {})
+        cached_packs = cached.get("packs", {}) if cached.get("mtime") == root_mtime else None
+        root_packs = {}
+        if cached_packs is None:
+            changed = True
+            try:
+                with os.scandir(root) as entries:
+                    names = sorted(entry.name for entry in entries if entry.is_dir())
+            except OSError:
+                names = []
+        else:
+            names = sorted(cached_packs)
+
+        for name in names:
+            path = os.path.join(root, name)
+            try:
+                mtime = os.stat(path).st_mtime_ns
+            except OSError:
+                changed = True
+                continue
+            previous = (cached_packs or {}).get(name)
+            if previous and previous["mtime"] == mtime:
+                has_icons = previous["icons"]
+            else:
+                has_icons = _has_icons(path)
+                changed = True
+            root_packs[name] = {"mtime": mtime, "icons": has_icons}
+            # Los paquetes de las primeras raíces tienen prioridad
+            if has_icons:
+                packs.setdefault(name, path)
+
+        new_manifest[root] = {"mtime": root_mtime, "packs": root_packs}
+
+    if changed or set(new_manifest) != set(manifest):
+        try:
+            xdg.write_atomic(manifest_path, json.dumps(new_manifest))
+        except OSError as e:
+            print(f"No se pudo guardar el manifiesto de paquetes de iconos: {e}")
+    return packs
@@ -0,0 +1,83 @@
+import gc
+
+from gi.repository import GLib
+
+# Segundos oculta o sin foco antes de liberar memoria (preferencia "idle_trim_seconds")
+DEFAULT_DELAY = 300
+
+
+def rss_kib():
+    """RSS actual del proceso (VmRSS) en KiB"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0
+
+
+def malloc_trim():
+    """Devolver al sistema la memoria libre del montículo de glibc"""
+    import ctypes
+
+    try:
+        # Símbolos ya cargados en el proceso: sin buscar la biblioteca con ldconfig
+        libc = ctypes.CDLL(None)
+        return bool(libc.malloc_trim(0))
+    except (OSError, AttributeError):
+        # Otra libc (musl) sin malloc_trim
+        return False
+
+
+class IdleTrimmer:
+    """Liberar memoria cuando la ventana lleva un tiempo oculta o sin foco.
+
+    ``set_idle(True)`` programa un único temporizador; si la ventana vuelve
+    antes de que venza se cancela sin hacer nada. Al vencer se llama a
+    ``trim`` y después se recolectan los ciclos de Python y se recorta el
+    montículo; al volver la ventana se llama a ``restore``. En ambos casos
+    se imprime el RSS antes y después.
+    """
+
+    def __init__(self, trim, restore, delay=DEFAULT_DELAY):
+        self._trim = trim
+        self._restore = restore
+        self.delay = delay
+        self.trimmed = False
+        self._timer_id = None
+
+    def set_idle(self, idle):
+        if idle:
+            if self._timer_id is None and not self.trimmed and self.delay > 0:
+                self._timer_id = GLib.timeout_add_seconds(self.delay, self._on_timeout)
+            return
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        if self.trimmed:
+            self.trimmed = False
+            before = rss_kib()
+            summary = self._restore()
+            print(f"Memoria al volver la ventana: RSS {before} -> {rss_kib()} KiB ({summary})")
+
+    def stop(self):
+        """Cancelar el temporizador pendiente (ventana destruida)"""
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+        self.delay = 0
+
+    def _on_timeout(self):
+        self._timer_id = None
+        before = rss_kib()
+        summary = self._trim()
+        if summary is None:
+            # No había nada que liberar (ventana aún sin mostrar)
+            return False
+        self.trimmed = True
+        gc.collect()
+        malloc_trim()
+        print(f"Memoria liberada tras {self.delay} s inactiva: RSS {before} -> {rss_kib()} KiB ({summary})")
+        return False
@@ -0,0 +1,174 @@
+import os
+import re
+import shlex
+from functools import lru_cache
+
+# Terminales que ejecutan el resto de la línea como comando ("sakura -e ...")
+TERMINALS = {"sakura": "-e", "xterm": "-e", "x-terminal-emulator": "-e", "xfce4-terminal": "-x"}
+
+# Programas que elevan privilegios y sus opciones que llevan un valor aparte
+ELEVATORS = {
+    "pkexec": {"--user"},
+    "sudo": {"-u", "-g", "-p", "-C", "-D", "-r", "-t", "-U", "-T"},
+    "doas": {"-u", "-C"},
+}
+
+# Opciones de env(1) que llevan un valor aparte
+ENV_OPTIONS = {"-u", "--unset", "-C", "--chdir"}
+
+# Separadores del shell tras los que ya no sigue el primer comando
+_SHELL_OPERATORS = set("|&;<>()")
+
+# Construcciones que solo un shell sabe interpretar
+_SHELL_SYNTAX = re.compile(r"[|&;<>()`*?\[\]{}]|\$\(|\\\n")
+_ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+
+class LaunchSpec:
+    """Cómo lanzar una entrada del catálogo sin pasar por /bin/sh"""
+
+    __slots__ = ("command", "argv", "env", "programs", "terminal", "elevated", "paths", "shell")
+
+    def __init__(self, command, argv, env=None, programs=(), terminal=False, elevated=False, paths=(),
+                 shell=False):
+        self.command = command
+        self.argv = argv
+        self.env = env
+        # Programas que deben existir: los envoltorios y el programa real (sakura, pkexec, tool)
+        self.programs = tuple(programs)
+        self.terminal = terminal
+        self.elevated = elevated
+        self.paths = tuple(paths)
+        self.shell = shell
+
+    @property
+    def program(self):
+        return self.argv[0]
+
+    def envp(self):
+        """Entorno completo para GLib.spawn_async (None si no hay cambios)"""
+        if not self.env:
+            return None
+        environ = {**os.environ, **self.env}
+        return [f"{key}={value}" for key, value in environ.items()]
+
+    def __repr__(self):
+        return f"LaunchSpec({self.argv!r}, terminal={self.terminal}, elevated={self.elevated}, shell={self.shell})"
+
+
+def _expand(token):
+    return os.path.expanduser(os.path.expandvars(token))
+
+
+def _skip_options(args, with_value, assignments=False):
+    # Posición del programa envuelto tras las opciones (y las asignaciones de env)
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == "--":
+            return index + 1
+        if arg.startswith("-"):
+            index += 2 if arg in with_value else 1
+        elif assignments and _ASSIGNMENT.match(arg):
+            index += 1
+        else:
+            break
+    return index
+
+
+def _split_inner(command):
+    try:
+        return [_expand(token) for token in shlex.split(command)]
+    except ValueError:
+        return command.split()
+
+
+def _unwrap(argv, paths):
+    """Seguir la cadena de envoltorios: (programas, terminal, elevación).
+
+    "env A=1 pkexec --user root tool" -> ["env", "pkexec", "tool"]. El comando
+    de "sakura -e" suele llegar en un solo argumento y se vuelve a dividir; sus
+    rutas absolutas se añaden a ``paths``.
+    """
+    programs = []
+    terminal = elevated = False
+    while argv:
+        program = argv[0]
+        name = os.path.basename(program)
+        programs.append(program)
+        if name in TERMINALS:
+            flag = TERMINALS[name]
+            if flag not in argv[1:]:
+                break
+            terminal = True
+            argv = argv[argv.index(flag, 1) + 1:]
+            if len(argv) == 1:
+                argv = _split_inner(argv[0])
+                paths.extend(arg for arg in argv if arg.startswith("/"))
+        elif name in ELEVATORS:
+            elevated = True
+            argv = argv[1:]
+            argv = argv[_skip_options(argv, ELEVATORS[name]):]
+        elif name == "env":
+            argv = argv[1:]
+            argv = argv[_skip_options(argv, ENV_OPTIONS, assignments=True):]
+        else:
+            break
+    return programs, terminal, elevated
+
+
+def _shell_spec(command):
+    # Para la disponibilidad basta con el primer comando de la línea
+    try:
+        lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+        lexer.whitespace_split = True
+        words = []
+        for word in lexer:
+            if set(word) <= _SHELL_OPERATORS:
+                break
+            words.append(word)
+    except ValueError:
+        words = command.split()
+    while words and _ASSIGNMENT.match(words[0]):
+        words.pop(0)
+    paths = []
+    programs, terminal, elevated = _unwrap([_expand(word) for word in words], paths)
+    return LaunchSpec(command, ["/bin/sh", "-c", command], None, programs, terminal, elevated, paths,
+                      shell=True)
+
+
+@lru_cache(maxsize=None)
+def compile_command(command):
+    """Convertir la línea de comando del catálogo en un LaunchSpec.
+
+    Se resuelven "~" y "$VAR", las asignaciones iniciales (VAR=valor) pasan al
+    entorno y se sigue la cadena de envoltorios (env, sakura -e, pkexec...)
+    para saber qué programas hacen falta y si hay terminal o elevación. Si la
+    línea usa sintaxis de shell (tuberías, redirecciones, comodines...) se
+    mantiene /bin/sh como último recurso.
+    """
+    unquoted = re.sub(r"'[^']*'|\"[^\"]*\"", "", command)
+    if _SHELL_SYNTAX.search(unquoted):
+        return _shell_spec(command)
+    try:
+        tokens = shlex.split(command)
+    except ValueError:
+        return _shell_spec(command)
+
+    env = {}
+    while tokens and _ASSIGNMENT.match(tokens[0]):
+        key, value = tokens.pop(0).split("=", 1)
+        env[key] = _expand(value)
+    if not tokens:
+        return _shell_spec(command)
+
+    argv = []
+    paths = []
+    for token in tokens:
+        expanded = _expand(token)
+        if expanded != token or expanded.startswith("/"):
+            paths.append(expanded)
+        argv.append(expanded)
+
+    programs, terminal, elevated = _unwrap(argv, paths)
+    return LaunchSpec(command, argv, env or None, programs, terminal, elevated, paths)
@@ -0,0 +1,81 @@
+import os
+import signal
+
+from gi.repository import GLib
+
+# Código de salida de /bin/sh cuando no encuentra el programa
+EXIT_NOT_FOUND = 127
+
+
+def is_not_found(error):
+    """El programa no existe (error de GLib.spawn_async al ejecutar sin shell)"""
+    return isinstance(error, GLib.Error) and error.matches(GLib.spawn_error_quark(), GLib.SpawnError.NOENT)
+
+
+class Launcher:
+    """Lanzador de herramientas sin hilos.
+
+    Los procesos se crean con ``GLib.spawn_async`` y su salida se recoge con un
+    ``child_watch`` en el bucle principal. Cada herramienta se identifica por
+    una clave (el comando) y no se vuelve a lanzar mientras siga en ejecución.
+    """
+
+    def __init__(self, on_state_changed=None, on_exited=None, on_error=None):
+        self.children = {}
+        self._watches = {}
+        self.on_state_changed = on_state_changed
+        self.on_exited = on_exited
+        self.on_error = on_error
+
+    def is_running(self, key):
+        return key in self.children
+
+    def launch(self, key, argv, envp=None):
+        """Lanzar argv salvo que la misma clave ya esté en marcha"""
+        if key in self.children:
+            print(f"Ya se está ejecutando, se ignora el clic: {key}")
+            return False
+
+        flags = GLib.SpawnFlags.SEARCH_PATH | GLib.SpawnFlags.DO_NOT_REAP_CHILD
+        # envp=None explícito no lo acepta PyGObject: solo se pasa si hay entorno propio
+        kwargs = {"envp": envp} if envp is not None else {}
+        try:
+            pid = GLib.spawn_async(argv, flags=flags, **kwargs)[0]
+        except (GLib.Error, TypeError, ValueError) as e:
+            print(f"No se pudo lanzar {key}: {getattr(e, 'message', e)}")
+            if self.on_error:
+                self.on_error(key, e)
+            return False
+
+        self.children[key] = pid
+        self._watches[key] = GLib.child_watch_add(GLib.PRIORITY_DEFAULT, pid, self._on_child_exit, key)
+        if self.on_state_changed:
+            self.on_state_changed(key, True)
+        return True
+
+    def _on_child_exit(self, pid, status, key):
+        GLib.spawn_close_pid(pid)
+        self.children.pop(key, None)
+        self._watches.pop(key, None)
+
+        if os.WIFSIGNALED(status):
+            exit_code, signum = None, os.WTERMSIG(status)
+        else:
+            exit_code, signum = os.WEXITSTATUS(status), None
+
+        if self.on_state_changed:
+            self.on_state_changed(key, False)
+        if self.on_exited:
+            self.on_exited(key, exit_code, signum)
+
+    def shutdown(self, terminate=False):
+        """Dejar de vigilar los hijos y, opcionalmente, terminarlos"""
+        for key, pid in list(self.children.items()):
+            GLib.source_remove(self._watches.pop(key))
+            if terminate:
+                try:
+                    os.kill(int(pid), signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            GLib.spawn_close_pid(pid)
+        self.children.clear()
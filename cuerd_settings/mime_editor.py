@@ -0,0 +1,185 @@
+import threading
+
+import gi
+gi.require_version("Gtk", "3.0")
+from gi.repository import Gio, GLib, Gtk, Pango  # noqa: E402
+
+from cuerd_settings.mime_index import MimeAssociations  # noqa: E402
+
+# Columnas del modelo de la lista de tipos
+COLUMN_MIME, COLUMN_PATTERNS, COLUMN_DEFAULT = range(3)
+
+# Patrones que se muestran por tipo (algunos tienen decenas)
+MAX_PATTERNS = 4
+
+
+class DefaultAppsWindow(Gtk.Window):
+    """Ventana no modal para elegir la aplicación predeterminada de cada tipo.
+
+    El índice de tipos y aplicaciones se carga en un hilo; la búsqueda filtra
+    la lista con ``MimeAssociations.search`` y elegir otra aplicación la guarda
+    al momento en el mimeapps.list del usuario.
+    """
+
+    def __init__(self, catalog, transient_for=None):
+        super().__init__(title=catalog.text("mime_title"), transient_for=transient_for)
+        self.catalog = catalog
+        self.associations = None
+        self.visible_types = set()
+        self.rows = {}
+        self.selected = None
+        self._filling = False
+        self._destroyed = False
+        self.set_default_size(700, 500)
+        self.connect("destroy", self.on_destroy)
+
+        search_entry = Gtk.SearchEntry()
+        search_entry.set_placeholder_text(catalog.text("mime_search"))
+        search_entry.connect("search-changed", self.on_search_changed)
+        search_entry.set_sensitive(False)
+        self.search_entry = search_entry
+
+        # Todas las filas (ya ordenadas) están en el modelo; la búsqueda solo cambia las visibles
+        self.store = Gtk.ListStore(str, str, str)
+        self.filter = self.store.filter_new()
+        self.filter.set_visible_func(lambda model, it, data: model[it][COLUMN_MIME] in self.visible_types)
+        self.tree = Gtk.TreeView(model=self.filter)
+        for title, column_id in (("mime_column_type", COLUMN_MIME),
+                                 ("mime_column_patterns", COLUMN_PATTERNS),
+                                 ("mime_column_default", COLUMN_DEFAULT)):
+            column = Gtk.TreeViewColumn(catalog.text(title), Gtk.CellRendererText(), text=column_id)
+            column.set_resizable(True)
+            self.tree.append_column(column)
+        self.tree.set_search_column(COLUMN_MIME)
+        self.tree.get_selection().connect("changed", self.on_selection_changed)
+
+        scrolled = Gtk.ScrolledWindow()
+        scrolled.set_vexpand(True)
+        scrolled.add(self.tree)
+
+        # Tipo seleccionado, aplicaciones que lo abren y botón para quitar la elección propia
+        self.type_label = Gtk.Label(label=catalog.text("mime_loading"))
+        self.type_label.set_halign(Gtk.Align.START)
+        self.type_label.set_ellipsize(Pango.EllipsizeMode.END)
+        self.handler_combo = Gtk.ComboBoxText()
+        self.handler_combo.set_sensitive(False)
+        self.handler_combo.connect("changed", self.on_handler_changed)
+        self.reset_button = Gtk.Button(label=catalog.text("mime_reset"))
+        self.reset_button.set_sensitive(False)
+        self.reset_button.connect("clicked", self.on_reset_clicked)
+
+        handler_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=10)
+        handler_box.pack_start(self.type_label, True, True, 0)
+        handler_box.pack_start(self.handler_combo, False, False, 0)
+        handler_box.pack_start(self.reset_button, False, False, 0)
+
+        box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, spacing=10)
+        box.set_margin_start(10)
+        box.set_margin_end(10)
+        box.set_margin_top(10)
+        box.set_margin_bottom(10)
+        box.pack_start(search_entry, False, False, 0)
+        box.pack_start(scrolled, True, True, 0)
+        box.pack_start(handler_box, False, False, 0)
+        self.add(box)
+
+        threading.Thread(target=self._load, name="mime-index", daemon=True).start()
+
+    def _load(self):
+        # Hilo de trabajo: mime.cache, .desktop y mimeapps.list
+        associations = MimeAssociations.load(self.catalog.locale)
+        GLib.idle_add(self.on_loaded, associations)
+
+    def on_loaded(self, associations):
+        if self._destroyed:
+            return False
+        self.associations = associations
+        # Sin modelo mientras se llena: la vista no se actualiza fila a fila
+        self.tree.set_model(None)
+        for mime in associations.types:
+            patterns = associations.database.patterns.get(mime, [])
+            self.rows[mime] = self.store.append([
+                mime, " ".join(patterns[:MAX_PATTERNS]), self.default_text(mime),
+            ])
+        self.visible_types = set(associations.types)
+        self.filter.refilter()
+        self.tree.set_model(self.filter)
+        self.search_entry.set_sensitive(True)
+        self.search_entry.grab_focus()
+        self.type_label.set_text(self.catalog.text("mime_select"))
+        print(f"Tipos MIME cargados: {len(associations.types)}, {len(associations.handlers)} aplicaciones")
+        return False
+
+    def default_text(self, mime):
+        desktop_id, explicit = self.associations.default_for(mime)
+        if desktop_id is None:
+            return ""
+        name = self.associations.name(desktop_id)
+        return name if explicit else self.catalog.text("mime_automatic", app=name)
+
+    def on_search_changed(self, entry):
+        if self.associations is not None:
+            self.visible_types = set(self.associations.search(entry.get_text()))
+            self.filter.refilter()
+
+    def on_selection_changed(self, selection):
+        model, tree_iter = selection.get_selected()
+        if tree_iter is None or self.associations is None:
+            return
+        self.selected = model[tree_iter][COLUMN_MIME]
+        self.type_label.set_text(f"{Gio.content_type_get_description(self.selected)} ({self.selected})")
+        self.update_handlers()
+
+    def update_handlers(self):
+        mime = self.selected
+        desktop_id, explicit = self.associations.default_for(mime)
+        handlers = self.associations.handlers_for(mime)
+        self._filling = True
+        self.handler_combo.remove_all()
+        for handler in handlers:
+            self.handler_combo.append(handler, self.associations.name(handler))
+        if desktop_id is not None:
+            self.handler_combo.set_active_id(desktop_id)
+        self._filling = False
+        self.handler_combo.set_sensitive(bool(handlers))
+        self.handler_combo.set_tooltip_text(None if handlers else self.catalog.text("mime_no_handlers"))
+        self.reset_button.set_sensitive(explicit)
+
+    def on_handler_changed(self, combo):
+        desktop_id = combo.get_active_id()
+        if self._filling or desktop_id is None or self.selected is None:
+            return
+        if self.associations.default_for(self.selected) == (desktop_id, True):
+            return
+        self.save_default(desktop_id)
+
+    def on_reset_clicked(self, button):  # pylint: disable=unused-argument
+        if self.selected is not None:
+            self.save_default(None)
+
+    def save_default(self, desktop_id):
+        mime = self.selected
+        try:
+            self.associations.set_default(mime, desktop_id)
+        except OSError as e:
+            self.type_label.set_text(self.catalog.text("mime_save_error", error=e))
+            return
+        print(f"Aplicación predeterminada para {mime}: {desktop_id}")
+        row = self.rows.get(self.associations.database.canonical(mime))
+        if row is not None:
+            self.store.set_value(row, COLUMN_DEFAULT, self.default_text(mime))
+        self.update_handlers()
+
+    def on_destroy(self, window):  # pylint: disable=unused-argument
+        self._destroyed = True
+
+
+def main():
+    """Abrir solo la ventana (settings.py --default-apps, usado por --launch)"""
+    from cuerd_settings.catalog import load_catalog
+
+    window = DefaultAppsWindow(load_catalog())
+    window.connect("destroy", Gtk.main_quit)
+    window.show_all()
+    Gtk.main()
+    return 0
@@ -0,0 +1,354 @@
+import mmap
+import os
+import struct
+
+from cuerd_settings import xdg
+from cuerd_settings.desktop_index import (
+    DesktopIndex, application_dirs, current_desktops, localized_name, read_desktop_group,
+)
+
+# Caché binaria de shared-mime-info (update-mime-database) en cada carpeta de datos
+MIME_CACHE = os.path.join("mime", "mime.cache")
+MIME_CACHE_MAJOR = 1
+# Lista de todos los tipos, incluidos los que no tienen patrones ni magia (inode/fifo...)
+MIME_TYPES = os.path.join("mime", "types")
+
+MIMEAPPS_FILE = "mimeapps.list"
+DEFAULT_GROUP = "Default Applications"
+ADDED_GROUP = "Added Associations"
+REMOVED_GROUP = "Removed Associations"
+
+# Índice en disco de los .desktop con MimeType (todas las aplicaciones)
+HANDLERS_INDEX_FILE = "mime_handlers.json"
+
+# Desplazamientos de las listas en la cabecera de mime.cache
+_ALIAS_LIST = 4
+_PARENT_LIST = 8
+_LITERAL_LIST = 12
+_REVERSE_SUFFIX_TREE = 16
+_GLOB_LIST = 20
+_MAGIC_LIST = 24
+_GENERIC_ICONS_LIST = 36
+
+
+class MimeCache:
+    """Lector de ``mime.cache`` sobre el archivo mapeado en memoria.
+
+    Solo se decodifican las cadenas de las listas que se piden; el sistema
+    comparte las páginas del archivo con el resto de programas que lo usan.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as cache_file:
+            self.data = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+        major, _minor = struct.unpack_from(">HH", self.data, 0)
+        if major != MIME_CACHE_MAJOR:
+            self.data.close()
+            raise ValueError(f"versión de mime.cache no compatible: {major}")
+        self.path = path
+        self._strings = {}
+
+    def _u32(self, offset):
+        return struct.unpack_from(">I", self.data, offset)[0]
+
+    def _string(self, offset):
+        # Los tipos se repiten mucho: cada cadena se decodifica una sola vez
+        value = self._strings.get(offset)
+        if value is None:
+            value = self.data[offset:self.data.find(b"\0", offset)].decode("utf-8", "replace")
+            self._strings[offset] = value
+        return value
+
+    def _pairs(self, header, size=8):
+        # Lista: número de elementos y registros de size bytes; los dos primeros campos son cadenas
+        offset = self._u32(header)
+        for index in range(self._u32(offset)):
+            first, second = struct.unpack_from(">II", self.data, offset + 4 + index * size)
+            yield first, second
+
+    def aliases(self):
+        """{alias: tipo canónico}"""
+        return {self._string(alias): self._string(mime) for alias, mime in self._pairs(_ALIAS_LIST)}
+
+    def parents(self):
+        """{tipo: [tipos de los que deriva]}"""
+        parents = {}
+        for mime, list_offset in self._pairs(_PARENT_LIST):
+            count = self._u32(list_offset)
+            parents[self._string(mime)] = [
+                self._string(self._u32(list_offset + 4 + index * 4)) for index in range(count)
+            ]
+        return parents
+
+    def patterns(self):
+        """{tipo: [patrones]}: nombres literales, globs y sufijos (*.pdf)"""
+        patterns = {}
+        for header in (_LITERAL_LIST, _GLOB_LIST):
+            for pattern, mime in self._pairs(header, size=12):
+                patterns.setdefault(self._string(mime), []).append(self._string(pattern))
+
+        # Árbol de sufijos invertido: cada nodo es (carácter, hijos, primer hijo) y
+        # las hojas (carácter 0) guardan el tipo en el lugar del número de hijos
+        tree = self._u32(_REVERSE_SUFFIX_TREE)
+        pending = [(self._u32(tree), self._u32(tree + 4), "")]
+        while pending:
+            count, first, suffix = pending.pop()
+            for index in range(count):
+                char, children, first_child = struct.unpack_from(">III", self.data, first + index * 12)
+                if char == 0:
+                    patterns.setdefault(self._string(children), []).append("*" + suffix)
+                else:
+                    pending.append((children, first_child, chr(char) + suffix))
+        return patterns
+
+    def types(self):
+        """Todos los tipos que aparecen en la caché"""
+        types = set(self.aliases().values())
+        types.update(self.parents())
+        types.update(self.patterns())
+        magic = self._u32(_MAGIC_LIST)
+        first = self._u32(magic + 8)
+        for index in range(self._u32(magic)):
+            types.add(self._string(self._u32(first + index * 16 + 4)))
+        types.update(self._string(mime) for mime, _ in self._pairs(_GENERIC_ICONS_LIST))
+        return types
+
+    def close(self):
+        self.data.close()
+
+
+class MimeDatabase:
+    """Tipos, alias y patrones de todas las mime.cache (la del usuario primero)"""
+
+    def __init__(self, data_dirs=None):
+        self.aliases = {}
+        self.parents = {}
+        self.patterns = {}
+        self.types = set()
+        for data_dir in data_dirs if data_dirs is not None else xdg.data_dirs():
+            try:
+                with open(os.path.join(data_dir, MIME_TYPES)) as types_file:
+                    self.types.update(line.strip() for line in types_file if line.strip())
+            except OSError:
+                pass
+            path = os.path.join(data_dir, MIME_CACHE)
+            try:
+                cache = MimeCache(path)
+            except (OSError, ValueError, struct.error) as e:
+                if not isinstance(e, FileNotFoundError):
+                    print(f"No se pudo leer {path}: {e}")
+                continue
+            try:
+                for key, values in ((self.aliases, cache.aliases()), (self.parents, cache.parents()),
+                                    (self.patterns, cache.patterns())):
+                    for name, value in values.items():
+                        key.setdefault(name, value)
+                self.types.update(cache.types())
+            except (struct.error, IndexError, ValueError) as e:
+                print(f"mime.cache dañada, se ignora: {path} ({e})")
+            finally:
+                cache.close()
+
+    def canonical(self, mime):
+        return self.aliases.get(mime, mime)
+
+
+def parse_mime_handler(path):
+    """Nombre, icono y tipos de un .desktop que abre archivos (para DesktopIndex)"""
+    group = read_desktop_group(path)
+    if group is None:
+        return None
+    fields, names = group
+    mime_types = [mime for mime in fields.get("MimeType", "").split(";") if mime]
+    if fields.get("Type") != "Application" or "" not in names or not mime_types:
+        return None
+    if fields.get("Hidden") == "true":
+        return None
+    return {
+        "names": names,
+        "icon": fields.get("Icon", ""),
+        "mime_types": mime_types,
+        "no_display": fields.get("NoDisplay") == "true",
+    }
+
+
+def parse_mimeapps(text):
+    """{grupo: {tipo: [identificadores .desktop]}} de un mimeapps.list"""
+    groups = {}
+    group = None
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("[") and line.endswith("]"):
+            group = groups.setdefault(line[1:-1], {})
+        elif group is not None and "=" in line:
+            key, value = (part.strip() for part in line.split("=", 1))
+            group[key] = [desktop_id for desktop_id in value.split(";") if desktop_id]
+    return groups
+
+
+def update_mimeapps(text, group, key, values):
+    """Cambiar (o quitar, con values vacío) una clave conservando el resto del archivo"""
+    lines = text.splitlines()
+    new_line = f"{key}={';'.join(values)};" if values else None
+    current = None
+    insert_at = None
+    for index, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith("[") and stripped.endswith("]"):
+            if current == group:
+                break
+            current = stripped[1:-1]
+            if current == group:
+                insert_at = index + 1
+            continue
+        if current == group:
+            if "=" in stripped and stripped.split("=", 1)[0].strip() == key:
+                if new_line is None:
+                    del lines[index]
+                else:
+                    lines[index] = new_line
+                return "\n".join(lines) + "\n"
+            if stripped:
+                insert_at = index + 1
+
+    if new_line is None:
+        return text
+    if insert_at is None:
+        if lines and lines[-1].strip():
+            lines.append("")
+        lines.extend([f"[{group}]", new_line])
+    else:
+        lines.insert(insert_at, new_line)
+    return "\n".join(lines) + "\n"
+
+
+def mimeapps_paths(desktops=None):
+    """Capas de mimeapps.list en orden de prioridad (especificación de XDG)"""
+    names = [f"{desktop.lower()}-{MIMEAPPS_FILE}" for desktop in sorted(desktops or ())] + [MIMEAPPS_FILE]
+    dirs = xdg.config_dirs() + application_dirs()
+    return [os.path.join(directory, name) for directory in dirs for name in names]
+
+
+class MimeAssociations:
+    """Aplicaciones de cada tipo MIME y la predeterminada.
+
+    Reúne los tipos de ``mime.cache``, los que declaran los ``.desktop``
+    (MimeType=) y las capas de ``mimeapps.list``. Todo se indexa una vez al
+    cargar; buscar y cambiar la predeterminada son operaciones en memoria y
+    la escritura del mimeapps.list del usuario es atómica.
+    """
+
+    def __init__(self, database, handlers, layers, user_path, locale="es"):
+        self.database = database
+        self.handlers = handlers
+        self.layers = layers
+        self.user_path = user_path
+        self.locale = locale
+        self._index()
+
+    @classmethod
+    def load(cls, locale="es", desktop=None):
+        handler_index = DesktopIndex(
+            index_path=xdg.app_cache_file(HANDLERS_INDEX_FILE), parse=parse_mime_handler
+        ).load()
+        layers = []
+        for path in mimeapps_paths(current_desktops(desktop)):
+            try:
+                with open(path, encoding="utf-8", errors="replace") as mimeapps_file:
+                    layers.append((path, parse_mimeapps(mimeapps_file.read())))
+            except OSError:
+                continue
+        user_path = os.path.join(xdg.config_home(), MIMEAPPS_FILE)
+        return cls(MimeDatabase(), dict(handler_index.files()), layers, user_path, locale)
+
+    def _index(self):
+        canonical = self.database.canonical
+        self.declared = {}
+        for desktop_id, handler in self.handlers.items():
+            for mime in handler["mime_types"]:
+                self.declared.setdefault(canonical(mime), []).append(desktop_id)
+        for desktop_ids in self.declared.values():
+            desktop_ids.sort(key=lambda desktop_id: self.name(desktop_id).lower())
+        self._index_layers()
+
+    def _index_layers(self):
+        canonical = self.database.canonical
+        self.defaults, self.added, self.removed = {}, {}, {}
+        # De menor a mayor prioridad: cada capa añade delante de las anteriores
+        for _, groups in reversed(self.layers):
+            for mime, desktop_ids in groups.get(DEFAULT_GROUP, {}).items():
+                self.defaults[canonical(mime)] = desktop_ids + self.defaults.get(canonical(mime), [])
+            for mime, desktop_ids in groups.get(ADDED_GROUP, {}).items():
+                self.added[canonical(mime)] = desktop_ids + self.added.get(canonical(mime), [])
+            for mime, desktop_ids in groups.get(REMOVED_GROUP, {}).items():
+                self.removed.setdefault(canonical(mime), set()).update(desktop_ids)
+
+        self.types = sorted(self.database.types | set(self.declared) | set(self.added) | set(self.defaults))
+        # Texto de búsqueda de cada tipo: nombre y patrones (pdf encuentra application/pdf)
+        self._search_text = [
+            (mime, " ".join([mime] + self.database.patterns.get(mime, [])).lower()) for mime in self.types
+        ]
+
+    def name(self, desktop_id):
+        handler = self.handlers.get(desktop_id)
+        if handler is None:
+            return desktop_id
+        return localized_name(handler["names"], self.locale)
+
+    def icon(self, desktop_id):
+        handler = self.handlers.get(desktop_id)
+        return handler["icon"] if handler else ""
+
+    def handlers_for(self, mime):
+        """Aplicaciones instaladas que abren el tipo, en orden de preferencia"""
+        mime = self.database.canonical(mime)
+        removed = self.removed.get(mime, set())
+        result = []
+        for desktop_id in self.added.get(mime, []) + self.declared.get(mime, []):
+            if desktop_id in self.handlers and desktop_id not in removed and desktop_id not in result:
+                result.append(desktop_id)
+        return result
+
+    def default_for(self, mime):
+        """(aplicación, explícita): la de mimeapps.list instalada o, si no, la primera que lo abre"""
+        mime = self.database.canonical(mime)
+        for desktop_id in self.defaults.get(mime, []):
+            if desktop_id in self.handlers:
+                return desktop_id, True
+        handlers = self.handlers_for(mime)
+        return (handlers[0] if handlers else None), False
+
+    def search(self, query):
+        """Tipos cuyo nombre o patrones contienen todas las palabras de la consulta"""
+        words = query.lower().split()
+        if not words:
+            return list(self.types)
+        return [mime for mime, text in self._search_text if all(word in text for word in words)]
+
+    def set_default(self, mime, desktop_id):
+        """Guardar la predeterminada en el mimeapps.list del usuario (None la quita)"""
+        mime = self.database.canonical(mime)
+        try:
+            with open(self.user_path, encoding="utf-8") as mimeapps_file:
+                text = mimeapps_file.read()
+        except FileNotFoundError:
+            text = ""
+        text = update_mimeapps(text, DEFAULT_GROUP, mime, [desktop_id] if desktop_id else [])
+        if desktop_id:
+            # Como gio mime: también se añade la asociación para que aparezca la primera
+            user_groups = parse_mimeapps(text)
+            added = [desktop_id] + [d for d in user_groups.get(ADDED_GROUP, {}).get(mime, []) if d != desktop_id]
+            text = update_mimeapps(text, ADDED_GROUP, mime, added)
+        xdg.write_atomic(self.user_path, text)
+
+        # Sustituir la capa del usuario, detrás de las de su escritorio ($desktop-mimeapps.list)
+        layer = (self.user_path, parse_mimeapps(text))
+        paths = [path for path, _ in self.layers]
+        if self.user_path in paths:
+            self.layers[paths.index(self.user_path)] = layer
+        else:
+            user_dir = os.path.dirname(self.user_path)
+            self.layers.insert(sum(1 for path in paths if os.path.dirname(path) == user_dir), layer)
+        self._index_layers()
@@ -0,0 +1,77 @@
+import queue
+import threading
+import time
+
+from gi.repository import GLib
+
+# Número máximo de avisos que se conservan en el historial
+HISTORY_SIZE = 50
+
+
+class Notification:
+    def __init__(self, key, message, detail, timestamp):
+        self.key = key
+        self.message = message
+        self.detail = detail
+        self.count = 1
+        self.first_time = timestamp
+        self.last_time = timestamp
+
+
+class NotificationQueue:
+    """Cola de avisos segura entre hilos.
+
+    ``post()`` puede llamarse desde cualquier hilo; los avisos se agrupan y se
+    entregan a ``on_notify`` en el bucle principal de GTK. Los avisos con la
+    misma clave (el comando) se fusionan en uno con un contador.
+    """
+
+    def __init__(self, on_notify, history_size=HISTORY_SIZE):
+        self.on_notify = on_notify
+        self.history_size = history_size
+        self.history = []
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._scheduled = False
+
+    def post(self, key, message, detail=None):
+        self._queue.put((key, message, detail, time.time()))
+        with self._lock:
+            if self._scheduled:
+                return
+            self._scheduled = True
+        GLib.idle_add(self._drain)
+
+    def _drain(self):
+        with self._lock:
+            self._scheduled = False
+
+        updated = []
+        while True:
+            try:
+                key, message, detail, timestamp = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            notification = self._coalesce(key, message, detail, timestamp)
+            if notification not in updated:
+                updated.append(notification)
+
+        if updated:
+            self.on_notify(updated)
+        return False
+
+    def _coalesce(self, key, message, detail, timestamp):
+        for index, notification in enumerate(self.history):
+            if notification.key == key:
+                notification.count += 1
+                notification.message = message
+                notification.detail = detail
+                notification.last_time = timestamp
+                # El más reciente queda al final del historial
+                self.history.append(self.history.pop(index))
+                return notification
+
+        notification = Notification(key, message, detail, timestamp)
+        self.history.append(notification)
+        del self.history[:-self.history_size]
+        return notification
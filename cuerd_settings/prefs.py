@@ -0,0 +1,169 @@
+import json
+import os
+
+from cuerd_settings import xdg
+from cuerd_settings.catalog import APP_DIR
+
+PREFS_FILE = "settings.json"
+
+# Archivo antiguo, guardado en el directorio de trabajo
+LEGACY_FILE = "icon_pack_config.json"
+
+# Tiempo que se agrupan los cambios antes de escribirlos
+DEBOUNCE_MS = 500
+
+# Con CUERD_SETTINGS_DISCOVER=1 (o la preferencia "discover_applications") se
+# añaden las herramientas de configuración instaladas (.desktop) a sus secciones
+DISCOVER_ENV = "CUERD_SETTINGS_DISCOVER"
+
+DEFAULTS = {
+    "icon_pack": "CuerdOS-Elementary",
+    "window_size": None,
+    "collapsed_sections": [],
+    "favorites": [],
+    "discover_applications": False,
+    "config_files": [],
+    "idle_trim_seconds": 300,
+}
+
+
+class PreferencesStore:
+    """Preferencias del usuario en $XDG_CONFIG_HOME/cuerd_settings/settings.json.
+
+    Las escrituras se agrupan con un temporizador y se hacen de forma atómica
+    (temporal + rename). Con ``watch()`` se recargan los cambios externos y se
+    avisa solo de las claves que han cambiado.
+    """
+
+    def __init__(self, path=None, debounce_ms=DEBOUNCE_MS):
+        self.path = path or os.path.join(xdg.config_home(), xdg.APP_DIR, PREFS_FILE)
+        self.debounce_ms = debounce_ms
+        self.values = dict(DEFAULTS)
+        self._listeners = []
+        self._save_id = None
+        self._monitor = None
+        self._last_written = None
+        self.load()
+
+    def _read(self):
+        try:
+            with open(self.path) as prefs_file:
+                return prefs_file.read()
+        except OSError:
+            return None
+
+    def load(self):
+        content = self._read()
+        if content is None:
+            self._migrate_legacy()
+            return
+        try:
+            data = json.loads(content)
+        except ValueError:
+            print(f"Preferencias dañadas, se usan los valores por defecto: {self.path}")
+            return
+        if isinstance(data, dict):
+            self.values.update(data)
+        self._last_written = content
+
+    def _migrate_legacy(self):
+        # Importar la configuración de versiones anteriores (directorio de trabajo o de la aplicación)
+        for directory in (os.getcwd(), APP_DIR):
+            try:
+                with open(os.path.join(directory, LEGACY_FILE)) as legacy_file:
+                    icon_pack = json.load(legacy_file).get("icon_pack")
+            except (OSError, ValueError, AttributeError):
+                continue
+            if icon_pack:
+                self.values["icon_pack"] = icon_pack
+                print(f"Configuración antigua importada: {icon_pack}")
+                return
+
+    def discover_applications(self):
+        return os.getenv(DISCOVER_ENV) == "1" or bool(self.get("discover_applications"))
+
+    def get(self, key, default=None):
+        value = self.values.get(key)
+        return default if value is None else value
+
+    def set(self, key, value):
+        if self.values.get(key) == value:
+            return
+        self.values[key] = value
+        self.schedule_save()
+
+    def connect(self, callback):
+        """callback(clave, valor) para los cambios hechos desde fuera"""
+        self._listeners.append(callback)
+
+    def schedule_save(self):
+        from gi.repository import GLib
+
+        # Reiniciar el temporizador: ráfagas de cambios producen una sola escritura
+        if self._save_id is not None:
+            GLib.source_remove(self._save_id)
+        self._save_id = GLib.timeout_add(self.debounce_ms, self._on_save_timeout)
+
+    def _on_save_timeout(self):
+        self._save_id = None
+        self.flush()
+        return False
+
+    def flush(self):
+        if self._save_id is not None:
+            from gi.repository import GLib
+
+            GLib.source_remove(self._save_id)
+            self._save_id = None
+
+        content = json.dumps(self.values, indent=2, sort_keys=True)
+        if content == self._last_written:
+            return
+        try:
+            xdg.write_atomic(self.path, content)
+            self._last_written = content
+        except OSError as e:
+            print(f"No se pudieron guardar las preferencias: {e}")
+
+    def watch(self):
+        """Vigilar el archivo para recargar los cambios hechos por otros procesos"""
+        from gi.repository import Gio
+
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        # Se vigila la carpeta: el guardado atómico sustituye el archivo
+        self._monitor = Gio.File.new_for_path(directory).monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        self._monitor.connect("changed", self._on_file_changed)
+
+    def _on_file_changed(self, monitor, file, other_file, event_type):  # pylint: disable=unused-argument
+        from gi.repository import Gio
+
+        name = os.path.basename(self.path)
+        if event_type in (Gio.FileMonitorEvent.RENAMED, Gio.FileMonitorEvent.MOVED_IN):
+            target = other_file if event_type == Gio.FileMonitorEvent.RENAMED else file
+        elif event_type in (Gio.FileMonitorEvent.CHANGES_DONE_HINT, Gio.FileMonitorEvent.CREATED):
+            target = file
+        else:
+            return
+        if target is None or target.get_basename() != name:
+            return
+        self.reload()
+
+    def reload(self):
+        content = self._read()
+        # Ignorar nuestras propias escrituras
+        if content is None or content == self._last_written:
+            return
+        try:
+            data = json.loads(content)
+        except ValueError:
+            return
+        self._last_written = content
+        if not isinstance(data, dict):
+            return
+
+        changed = [key for key, value in data.items() if self.values.get(key) != value]
+        self.values.update(data)
+        for key in changed:
+            for callback in self._listeners:
+                callback(key, self.values[key])
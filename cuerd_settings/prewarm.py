@@ -0,0 +1,262 @@
+import os
+import threading
+import time
+from collections import deque
+
+from cuerd_settings.command_index import find_program
+from cuerd_settings.launch_spec import compile_command
+
+# Pausa mínima entre dos precargas y número de peticiones en espera
+MIN_INTERVAL = 0.2
+MAX_PENDING = 4
+
+# Límite de archivos que se precargan por herramienta
+MAX_FILES = 200
+
+PT_LOAD = 1
+PT_DYNAMIC = 2
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_RPATH = 15
+DT_RUNPATH = 29
+
+DEFAULT_LIB_DIRS = ["/lib", "/usr/lib", "/lib64", "/usr/lib64"]
+
+
+def read_ld_so_conf(path="/etc/ld.so.conf", seen=None):
+    """Directorios de bibliotecas de ld.so.conf (con sus "include")"""
+    seen = set() if seen is None else seen
+    if path in seen:
+        return []
+    seen.add(path)
+    dirs = []
+    try:
+        with open(path) as conf:
+            lines = conf.readlines()
+    except OSError:
+        return dirs
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line:
+            continue
+        if line.startswith("include"):
+            pattern = line.split(None, 1)[1]
+            if not os.path.isabs(pattern):
+                pattern = os.path.join(os.path.dirname(path), pattern)
+            import glob
+
+            for included in sorted(glob.glob(pattern)):
+                dirs.extend(read_ld_so_conf(included, seen))
+        else:
+            dirs.append(line)
+    return dirs
+
+
+def elf_dependencies(path):
+    """Leer DT_NEEDED y RPATH/RUNPATH de la sección dinámica de un ELF.
+
+    Devuelve (bibliotecas, rutas) o None si el archivo no es un ELF o está
+    truncado; los tamaños se comprueban antes de desempaquetar.
+    """
+    with open(path, "rb") as elf:
+        ident = elf.read(16)
+        if len(ident) < 16 or ident[:4] != b"\x7fELF":
+            return None
+        is64 = ident[4] == 2
+        endian = "<" if ident[5] == 1 else ">"
+        # Solo se necesita al pasar el puntero por un botón, no al arrancar
+        import struct
+
+        if is64:
+            header = struct.Struct(endian + "HHIQQQIHHHHHH")
+        else:
+            header = struct.Struct(endian + "HHIIIIIHHHHHH")
+        data = elf.read(header.size)
+        if len(data) < header.size:
+            return None
+        fields = header.unpack(data)
+        phoff, phentsize, phnum = fields[4], fields[8], fields[9]
+
+        if is64:
+            phdr = struct.Struct(endian + "IIQQQQQQ")
+        else:
+            phdr = struct.Struct(endian + "IIIIIIII")
+        if phentsize < phdr.size:
+            return None
+
+        loads = []
+        dynamic = None
+        elf.seek(phoff)
+        table = elf.read(phentsize * phnum)
+        if len(table) < phentsize * phnum:
+            return None
+        for index in range(phnum):
+            entry = phdr.unpack_from(table, index * phentsize)
+            if is64:
+                p_type, _, p_offset, p_vaddr, _, p_filesz, _, _ = entry
+            else:
+                p_type, p_offset, p_vaddr, _, p_filesz, _, _, _ = entry
+            if p_type == PT_LOAD:
+                loads.append((p_vaddr, p_offset, p_filesz))
+            elif p_type == PT_DYNAMIC:
+                dynamic = (p_offset, p_filesz)
+        if dynamic is None:
+            return [], []
+
+        dyn = struct.Struct(endian + ("qQ" if is64 else "iI"))
+        elf.seek(dynamic[0])
+        data = elf.read(dynamic[1])
+        needed, paths, strtab = [], [], None
+        for offset in range(0, len(data) - dyn.size + 1, dyn.size):
+            tag, value = dyn.unpack_from(data, offset)
+            if tag == DT_NULL:
+                break
+            if tag == DT_NEEDED:
+                needed.append(value)
+            elif tag in (DT_RPATH, DT_RUNPATH):
+                paths.append(value)
+            elif tag == DT_STRTAB:
+                strtab = value
+
+        # DT_STRTAB es una dirección virtual: pasarla a desplazamiento en el archivo
+        if strtab is None:
+            return [], []
+        for vaddr, file_offset, size in loads:
+            if vaddr <= strtab < vaddr + size:
+                strtab = strtab - vaddr + file_offset
+                break
+        else:
+            return [], []
+
+        def read_string(offset):
+            elf.seek(strtab + offset)
+            chunk = elf.read(256)
+            return chunk.split(b"\0", 1)[0].decode(errors="replace")
+
+        return [read_string(value) for value in needed], [read_string(value) for value in paths]
+
+
+def script_interpreter(path):
+    """Intérprete del shebang ("#!/usr/bin/env python3" -> python3)"""
+    with open(path, "rb") as script:
+        line = script.read(256).split(b"\n", 1)[0]
+    if not line.startswith(b"#!"):
+        return None
+    parts = line[2:].decode(errors="replace").split()
+    if not parts:
+        return None
+    if os.path.basename(parts[0]) == "env":
+        programs = [part for part in parts[1:] if not part.startswith("-") and "=" not in part]
+        return find_program(programs[0]) if programs else None
+    return parts[0]
+
+
+def readahead(path):
+    # Pedir al núcleo que cargue el archivo en la caché de páginas sin leerlo aquí
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
+
+class Prewarmer:
+    """Precarga en la caché de páginas los archivos de una herramienta.
+
+    Al pasar el puntero sobre un botón se resuelve el comando y se precargan
+    los programas de su LaunchSpec (terminal y pkexec incluidos), las rutas
+    que recibe, sus bibliotecas (leídas de la sección dinámica del ELF) o el
+    intérprete del script. Cada comando se precarga una vez por sesión, con
+    un único hilo y una pausa mínima entre peticiones.
+    """
+
+    def __init__(self):
+        self._done = set()
+        self._warmed_files = set()
+        self._pending = deque(maxlen=MAX_PENDING)
+        self._condition = threading.Condition()
+        self._thread = None
+        self._lib_dirs = None
+
+    def request(self, command):
+        with self._condition:
+            if command in self._done or command in self._pending:
+                return
+            # Si hay demasiadas peticiones se descartan las más antiguas
+            self._pending.append(command)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="prewarm", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _worker(self):
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                command = self._pending.pop()
+                self._done.add(command)
+            started = time.monotonic()
+            try:
+                count = self.prewarm(command)
+                print(f"Precargados {count} archivos para: {command}")
+            except (OSError, ValueError) as e:
+                # Un error aquí no debe terminar el único hilo de precarga
+                print(f"No se pudo precargar {command}: {e}")
+            time.sleep(max(0.0, MIN_INTERVAL - (time.monotonic() - started)))
+
+    def lib_dirs(self):
+        if self._lib_dirs is None:
+            dirs = os.environ.get("LD_LIBRARY_PATH", "").split(":") + read_ld_so_conf() + DEFAULT_LIB_DIRS
+            self._lib_dirs = [d for d in dict.fromkeys(dirs) if d and os.path.isdir(d)]
+        return self._lib_dirs
+
+    def _find_library(self, name, origin, rpaths):
+        if "/" in name:
+            return name if os.path.exists(name) else None
+        dirs = [rpath.replace("$ORIGIN", origin).replace("${ORIGIN}", origin)
+                for entry in rpaths for rpath in entry.split(":")]
+        for directory in dirs + self.lib_dirs():
+            path = os.path.join(directory, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def collect_files(self, command):
+        """Ejecutables, intérpretes y bibliotecas que necesita el comando"""
+        spec = compile_command(command)
+        # Los programas de la cadena (terminal, pkexec...) y los archivos que recibe
+        queue = [find_program(program) for program in spec.programs]
+        queue.extend(spec.paths)
+        files = []
+        seen = set()
+        while queue and len(files) < MAX_FILES:
+            path = queue.pop(0)
+            if not path:
+                continue
+            path = os.path.realpath(path)
+            if path in seen or not os.path.isfile(path):
+                continue
+            seen.add(path)
+            files.append(path)
+
+            deps = elf_dependencies(path)
+            if deps is None:
+                queue.append(script_interpreter(path))
+                continue
+            needed, rpaths = deps
+            origin = os.path.dirname(path)
+            queue.extend(self._find_library(name, origin, rpaths) for name in needed)
+        return files
+
+    def prewarm(self, command):
+        count = 0
+        for path in self.collect_files(command):
+            # Las bibliotecas comunes (libc, gtk...) solo se piden una vez
+            if path in self._warmed_files:
+                continue
+            readahead(path)
+            self._warmed_files.add(path)
+            count += 1
+        return count
@@ -0,0 +1,126 @@
+import re
+import unicodedata
+from bisect import bisect_left
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Similitud mínima (coeficiente de Dice sobre trigramas) para la búsqueda aproximada
+FUZZY_THRESHOLD = 0.45
+
+
+def normalize(text):
+    """Minúsculas y sin tildes, para que "energia" encuentre "Energía" """
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def trigrams(token):
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def scan(documents, query):
+    """Búsqueda lineal por subcadena, mientras el índice no está construido"""
+    terms = tokenize(query)
+    if not terms:
+        return None
+    return {
+        doc_id for doc_id, texts in enumerate(documents)
+        if all(term in normalize(" ".join(texts)) for term in terms)
+    }
+
+
+class SearchIndex:
+    """Índice invertido de términos y trigramas sobre las entradas del catálogo.
+
+    Cada documento es una lista de textos (etiqueta, título de la sección,
+    descripción, comando). Una consulta devuelve los documentos que contienen
+    todos sus términos, por prefijo, por subcadena o de forma aproximada.
+    """
+
+    def __init__(self, documents):
+        tokens = {}
+        self.doc_count = len(documents)
+        for doc_id, texts in enumerate(documents):
+            for text in texts:
+                for token in tokenize(text):
+                    tokens.setdefault(token, set()).add(doc_id)
+
+        self.tokens = sorted(tokens)
+        self.postings = [frozenset(tokens[token]) for token in self.tokens]
+
+        # trigrama -> índices de términos que lo contienen
+        self.grams = {}
+        for token_id, token in enumerate(self.tokens):
+            for gram in trigrams(token):
+                self.grams.setdefault(gram, []).append(token_id)
+
+        self._cache = {}
+
+    def _prefix_tokens(self, term):
+        start = bisect_left(self.tokens, term)
+        end = start
+        while end < len(self.tokens) and self.tokens[end].startswith(term):
+            end += 1
+        return range(start, end)
+
+    def _substring_tokens(self, term):
+        # Candidatos con todos los trigramas internos del término y verificación final
+        inner = [term[i:i + 3] for i in range(len(term) - 2)]
+        candidates = None
+        for gram in inner:
+            token_ids = self.grams.get(gram)
+            if not token_ids:
+                return []
+            candidates = set(token_ids) if candidates is None else candidates.intersection(token_ids)
+            if not candidates:
+                return []
+        return [token_id for token_id in candidates if term in self.tokens[token_id]]
+
+    def _fuzzy_tokens(self, term):
+        grams = trigrams(term)
+        shared = {}
+        for gram in grams:
+            for token_id in self.grams.get(gram, ()):
+                shared[token_id] = shared.get(token_id, 0) + 1
+        matches = []
+        for token_id, count in shared.items():
+            total = len(grams) + len(self.tokens[token_id]) + 1
+            if 2 * count / total >= FUZZY_THRESHOLD:
+                matches.append(token_id)
+        return matches
+
+    def _match_term(self, term):
+        docs = self._cache.get(term)
+        if docs is not None:
+            return docs
+
+        token_ids = list(self._prefix_tokens(term))
+        if len(term) >= 3:
+            token_ids.extend(self._substring_tokens(term))
+            if not token_ids:
+                token_ids = self._fuzzy_tokens(term)
+
+        docs = frozenset().union(*(self.postings[token_id] for token_id in token_ids))
+        if len(self._cache) > 256:
+            self._cache.clear()
+        self._cache[term] = docs
+        return docs
+
+    def search(self, query):
+        """Devolver el conjunto de documentos que coinciden (None si la consulta está vacía)"""
+        terms = tokenize(query)
+        if not terms:
+            return None
+        result = None
+        # Empezar por el término más largo, que suele ser el más selectivo
+        for term in sorted(set(terms), key=len, reverse=True):
+            docs = self._match_term(term)
+            result = docs if result is None else result & docs
+            if not result:
+                break
+        return result
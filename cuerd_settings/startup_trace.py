@@ -0,0 +1,141 @@
+import json
+import os
+import threading
+import time
+
+# Variable de entorno y opción de línea de comandos que activan la traza
+TRACE_ENV = "CUERD_SETTINGS_TRACE"
+TRACE_FLAG = "--trace"
+
+
+class _NullSpan:
+    # Contexto vacío reutilizado cuando la traza está desactivada
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.tracer.add(self.name, self.cat, self.start, time.perf_counter(), self.args)
+        return False
+
+
+class StartupTracer:
+    """Registro de fases del arranque en formato "trace event" de Chrome.
+
+    Se activa con ``CUERD_SETTINGS_TRACE=<ruta>`` (o ``1`` para una ruta
+    temporal) o con ``--trace[=<ruta>]``. Desactivado no tiene coste apreciable.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.output = None
+        self.events = []
+        self.origin = time.perf_counter()
+        self._open = {}
+        self._lock = threading.Lock()
+
+    def configure(self, argv, environ=None):
+        environ = os.environ if environ is None else environ
+        path = environ.get(TRACE_ENV) or None
+
+        # Retirar la opción de argv para que GTK no la interprete
+        for arg in list(argv[1:]):
+            if arg == TRACE_FLAG:
+                path = path or "1"
+                argv.remove(arg)
+            elif arg.startswith(TRACE_FLAG + "="):
+                path = arg.split("=", 1)[1]
+                argv.remove(arg)
+
+        if not path or path == "0":
+            return
+        if path in ("1", "yes", "true"):
+            import tempfile
+
+            path = os.path.join(tempfile.gettempdir(), f"cuerd_settings-trace-{os.getpid()}.json")
+        self.output = path
+        self.enabled = True
+
+    def span(self, name, cat="startup", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def begin(self, name, cat="startup"):
+        # Fases que empiezan y terminan en callbacks distintos (show_all -> draw)
+        if self.enabled:
+            self._open[name] = (cat, time.perf_counter())
+
+    def end(self, name, **args):
+        if not self.enabled or name not in self._open:
+            return
+        cat, start = self._open.pop(name)
+        self.add(name, cat, start, time.perf_counter(), args)
+
+    def add(self, name, cat, start, end, args=None):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self.origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_native_id(),
+        }
+        if args:
+            event["args"] = args
+        with self._lock:
+            self.events.append(event)
+
+    def write(self):
+        if not self.enabled:
+            return
+        with self._lock:
+            events = list(self.events)
+        with open(self.output, "w") as trace_file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, trace_file)
+
+    def summary(self):
+        # Agrupar por categoría y nombre: número de llamadas, total y máximo en ms
+        rows = {}
+        with self._lock:
+            events = list(self.events)
+        for event in events:
+            key = (event["cat"], event["name"])
+            count, total, worst = rows.get(key, (0, 0.0, 0.0))
+            dur = event["dur"] / 1000
+            rows[key] = (count + 1, total + dur, max(worst, dur))
+
+        lines = [f"{'Categoría':<10} {'Fase':<48} {'N':>4} {'Total ms':>10} {'Máx ms':>9}"]
+        for (cat, name), (count, total, worst) in sorted(rows.items(), key=lambda item: -item[1][1]):
+            lines.append(f"{cat:<10} {name[:48]:<48} {count:>4} {total:>10.2f} {worst:>9.2f}")
+        return "\n".join(lines)
+
+    def finish(self):
+        """Guardar la traza e imprimir la tabla de resumen"""
+        if not self.enabled:
+            return
+        self.write()
+        print(self.summary())
+        print(f"Traza de arranque guardada en: {self.output}")
+
+
+tracer = StartupTracer()
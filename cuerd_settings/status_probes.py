@@ -0,0 +1,236 @@
+import os
+import time
+
+from gi.repository import GLib
+
+POWER_SUPPLY_DIR = "/sys/class/power_supply"
+NET_DIR = "/sys/class/net"
+RFKILL_DIR = "/sys/class/rfkill"
+PROC_WIRELESS = "/proc/net/wireless"
+
+# Calidad máxima de enlace que publica /proc/net/wireless
+WIRELESS_MAX_QUALITY = 70
+
+# Las fuentes que vencen dentro de este margen se leen en la misma pasada
+BATCH_SLACK = 2.0
+
+
+def _read(path):
+    try:
+        with open(path) as sys_file:
+            return sys_file.read().strip()
+    except OSError:
+        return None
+
+
+def _children(directory):
+    try:
+        return sorted(os.listdir(directory))
+    except OSError:
+        return []
+
+
+def battery_status(root=POWER_SUPPLY_DIR):
+    """Carga de la batería y estado de la corriente, o None sin batería"""
+    percents, charging, ac = [], False, False
+    for name in _children(root):
+        path = os.path.join(root, name)
+        supply_type = _read(os.path.join(path, "type"))
+        if supply_type == "Mains":
+            ac = ac or _read(os.path.join(path, "online")) == "1"
+        elif supply_type == "Battery" and _read(os.path.join(path, "present")) != "0":
+            capacity = _read(os.path.join(path, "capacity"))
+            if capacity and capacity.isdigit():
+                percents.append(int(capacity))
+            charging = charging or _read(os.path.join(path, "status")) == "Charging"
+    if not percents:
+        return None
+    return {"percent": sum(percents) // len(percents), "charging": charging, "ac": ac}
+
+
+def _wireless_quality(path=PROC_WIRELESS):
+    # Inter-| sta-|   Quality        |
+    #  face | tus | link level noise |
+    #  wlan0: 0000   54.  -56.  -256
+    qualities = {}
+    content = _read(path) or ""
+    for line in content.splitlines()[2:]:
+        if ":" not in line:
+            continue
+        iface, values = line.split(":", 1)
+        fields = values.split()
+        try:
+            qualities[iface.strip()] = float(fields[1].rstrip("."))
+        except (IndexError, ValueError):
+            continue
+    return qualities
+
+
+def network_status(root=NET_DIR, wireless_path=PROC_WIRELESS):
+    """Enlaces activos: cable conectado y calidad de la Wi-Fi"""
+    wired, wifi = False, None
+    qualities = None
+    for iface in _children(root):
+        if iface == "lo":
+            continue
+        path = os.path.join(root, iface)
+        if _read(os.path.join(path, "operstate")) != "up":
+            continue
+        if os.path.isdir(os.path.join(path, "wireless")) or os.path.isdir(os.path.join(path, "phy80211")):
+            if qualities is None:
+                qualities = _wireless_quality(wireless_path)
+            quality = qualities.get(iface, 0.0)
+            percent = min(100, round(quality * 100 / WIRELESS_MAX_QUALITY))
+            wifi = percent if wifi is None else max(wifi, percent)
+        elif not os.path.isdir(os.path.join(path, "bridge")) and os.path.exists(os.path.join(path, "device")):
+            # Solo interfaces físicas: los puentes y las virtuales no cuentan
+            wired = True
+    return {"wired": wired, "wifi": wifi}
+
+
+def bluetooth_status(root=RFKILL_DIR):
+    """True/False si hay un adaptador Bluetooth encendido/apagado, None si no hay"""
+    powered = None
+    for name in _children(root):
+        path = os.path.join(root, name)
+        if _read(os.path.join(path, "type")) != "bluetooth":
+            continue
+        blocked = _read(os.path.join(path, "soft")) == "1" or _read(os.path.join(path, "hard")) == "1"
+        powered = bool(powered) or not blocked
+    return powered
+
+
+def disk_status(path="/"):
+    """Espacio libre y total del sistema de archivos de path"""
+    try:
+        st = os.statvfs(path)
+    except OSError:
+        return None
+    return {"free": st.f_bavail * st.f_frsize, "total": st.f_blocks * st.f_frsize}
+
+
+class StatusSource:
+    """Lectura periódica que se muestra junto al título de una sección"""
+
+    def __init__(self, section_id, read, describe, interval):
+        self.section_id = section_id
+        self.read = read
+        self.describe = describe
+        self.interval = interval
+        self.text = None
+        self.next_due = 0.0
+
+
+class StatusPoller:
+    """Un único temporizador de GLib para todas las lecturas de estado.
+
+    Cada fuente tiene su propio intervalo; el temporizador se programa para
+    la próxima que venza y en cada pasada se leen también las que vencen poco
+    después, de modo que las lecturas se agrupan en el mismo despertar. Con
+    ``set_active(False)`` (ventana oculta o sin foco) no queda ningún
+    temporizador pendiente; al reactivarse se leen las fuentes atrasadas.
+    """
+
+    def __init__(self, sources):
+        self.sources = sources
+        self.labels = {}
+        self.active = False
+        self._timer_id = None
+
+    def attach(self, section_id, label):
+        """Asociar la etiqueta del título de una sección ya construida"""
+        if not any(source.section_id == section_id for source in self.sources):
+            return
+        self.labels[section_id] = label
+        self._update_label(section_id)
+        if self.active:
+            self._poll()
+
+    def detach(self, section_id):
+        """Olvidar la etiqueta de una sección destruida"""
+        self.labels.pop(section_id, None)
+
+    def set_active(self, active):
+        if active == self.active:
+            return
+        self.active = active
+        if active:
+            self._poll()
+        elif self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+    def _poll(self):
+        if self._timer_id is not None:
+            GLib.source_remove(self._timer_id)
+            self._timer_id = None
+
+        now = time.monotonic()
+        changed = set()
+        for source in self.sources:
+            # Las secciones sin construir no se leen
+            if source.section_id not in self.labels or source.next_due > now + BATCH_SLACK:
+                continue
+            text = source.describe(source.read())
+            source.next_due = now + source.interval
+            if text != source.text:
+                source.text = text
+                changed.add(source.section_id)
+        for section_id in changed:
+            self._update_label(section_id)
+
+        pending = [source.next_due for source in self.sources if source.section_id in self.labels]
+        if pending:
+            delay = max(1, round(min(pending) - now))
+            # timeout_add_seconds agrupa los despertares con otros temporizadores
+            self._timer_id = GLib.timeout_add_seconds(delay, self._on_timeout)
+
+    def _on_timeout(self):
+        self._timer_id = None
+        self._poll()
+        return False
+
+    def _update_label(self, section_id):
+        label = self.labels.get(section_id)
+        if label is None:
+            return
+        texts = [source.text for source in self.sources if source.section_id == section_id and source.text]
+        label.set_text(" · ".join(texts))
+        label.set_visible(bool(texts))
+
+
+def default_sources(text):
+    """Fuentes de estado de las secciones del catálogo; text es Catalog.text"""
+
+    def describe_battery(status):
+        if status is None:
+            return None
+        if status["charging"]:
+            return text("status_battery_charging", percent=status["percent"])
+        if status["ac"]:
+            return text("status_battery_ac", percent=status["percent"])
+        return text("status_battery", percent=status["percent"])
+
+    def describe_network(status):
+        if status["wifi"] is not None:
+            return text("status_wifi", quality=status["wifi"])
+        if status["wired"]:
+            return text("status_wired")
+        return text("status_offline")
+
+    def describe_bluetooth(powered):
+        if powered is None:
+            return None
+        return text("status_bluetooth_on" if powered else "status_bluetooth_off")
+
+    def describe_disk(status):
+        if status is None:
+            return None
+        return text("status_disk", free=GLib.format_size(status["free"]), total=GLib.format_size(status["total"]))
+
+    return [
+        StatusSource("power", battery_status, describe_battery, 60),
+        StatusSource("network", network_status, describe_network, 10),
+        StatusSource("network", bluetooth_status, describe_bluetooth, 30),
+        StatusSource("hardware", disk_status, describe_disk, 120),
+    ]
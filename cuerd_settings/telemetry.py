@@ -0,0 +1,147 @@
+import json
+import os
+import time
+
+from cuerd_settings import xdg
+
+LAUNCHES_FILE = "launches.jsonl"
+
+# Registros que se conservan; al doblarse se reescribe el archivo con los últimos
+MAX_RECORDS = 500
+
+# Tiempo máximo entre el clic y la aparición de la ventana de la herramienta
+MAP_TIMEOUT = 30.0
+
+# Vida media (en días) del peso de un lanzamiento en la sección "Frecuentes"
+HALF_LIFE_DAYS = 14.0
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    if not values:
+        return None
+    index = min(len(values) - 1, max(0, round(fraction * (len(values) - 1))))
+    return values[index]
+
+
+class LaunchTelemetry:
+    """Registro local de lanzamientos: hora del clic, latencia hasta que
+    aparece la ventana (o hasta el spawn, como aproximación), código de salida
+    y duración. Se guarda en $XDG_STATE_HOME/cuerd_settings/launches.jsonl.
+    """
+
+    def __init__(self, path=None, max_records=MAX_RECORDS):
+        self.path = path or os.path.join(xdg.state_home(), xdg.APP_DIR, LAUNCHES_FILE)
+        self.max_records = max_records
+        self.records = []
+        self._lines = 0
+        self._active = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path) as launches_file:
+                lines = launches_file.readlines()
+        except OSError:
+            return
+        self._lines = len(lines)
+        for line in lines[-self.max_records:]:
+            try:
+                self.records.append(json.loads(line))
+            except ValueError:
+                continue
+
+    def start(self, key, entry_id):
+        """Clic en una herramienta (key es la clave del lanzador)"""
+        self._active[key] = {
+            "id": entry_id,
+            "t": time.time(),
+            "start": time.monotonic(),
+            "latency": None,
+            "proxy": None,
+        }
+
+    def discard(self, key):
+        self._active.pop(key, None)
+
+    def spawned(self, key):
+        # Aproximación mientras no se sepa cuándo aparece la ventana
+        launch = self._active.get(key)
+        if launch is not None and launch["latency"] is None:
+            launch["latency"] = time.monotonic() - launch["start"]
+            launch["proxy"] = "spawn"
+
+    def window_mapped(self):
+        """La ventana del panel pierde el foco: se atribuye al último lanzamiento"""
+        now = time.monotonic()
+        pending = [launch for launch in self._active.values()
+                   if launch["proxy"] != "focus" and now - launch["start"] < MAP_TIMEOUT]
+        if not pending:
+            return
+        launch = max(pending, key=lambda item: item["start"])
+        launch["latency"] = now - launch["start"]
+        launch["proxy"] = "focus"
+
+    def finish(self, key, exit_code, signum):
+        launch = self._active.pop(key, None)
+        if launch is None:
+            return
+        record = {
+            "id": launch["id"],
+            "t": round(launch["t"], 3),
+            "latency": None if launch["latency"] is None else round(launch["latency"], 4),
+            "proxy": launch["proxy"],
+            "exit": exit_code,
+            "signal": signum,
+            "duration": round(time.monotonic() - launch["start"], 3),
+        }
+        self.records.append(record)
+        del self.records[:-self.max_records]
+        self._append(record)
+
+    def _append(self, record):
+        try:
+            # Rotación: cuando el archivo dobla el límite se conservan los últimos registros
+            if self._lines + 1 > 2 * self.max_records:
+                content = "".join(json.dumps(item) + "\n" for item in self.records)
+                xdg.write_atomic(self.path, content)
+                self._lines = len(self.records)
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(self.path, "a") as launches_file:
+                launches_file.write(json.dumps(record) + "\n")
+            self._lines += 1
+        except OSError as e:
+            print(f"No se pudo guardar el registro de lanzamientos: {e}")
+
+    def shutdown(self):
+        # Herramientas que siguen abiertas al cerrar el panel: sin código de salida
+        for key in list(self._active):
+            self.finish(key, None, None)
+
+    def ranked(self, limit=6, now=None):
+        """Entradas ordenadas por frecuencia ponderada por lo recientes que son"""
+        now = time.time() if now is None else now
+        scores = {}
+        for record in self.records:
+            age_days = max(0.0, now - record["t"]) / 86400
+            scores[record["id"]] = scores.get(record["id"], 0.0) + 0.5 ** (age_days / HALF_LIFE_DAYS)
+        return sorted(scores, key=lambda entry_id: -scores[entry_id])[:limit]
+
+    def report(self):
+        """Tabla con la latencia p50/p95 por herramienta"""
+        latencies = {}
+        counts = {}
+        for record in self.records:
+            counts[record["id"]] = counts.get(record["id"], 0) + 1
+            if record.get("latency") is not None:
+                latencies.setdefault(record["id"], []).append(record["latency"] * 1000)
+
+        lines = [f"{'Herramienta':<24} {'N':>5} {'p50 ms':>9} {'p95 ms':>9}"]
+        for entry_id in sorted(counts, key=lambda item: -counts[item]):
+            values = latencies.get(entry_id, [])
+            p50 = _percentile(values, 0.5)
+            p95 = _percentile(values, 0.95)
+            lines.append(f"{entry_id:<24} {counts[entry_id]:>5} "
+                         f"{'-' if p50 is None else f'{p50:.0f}':>9} {'-' if p95 is None else f'{p95:.0f}':>9}")
+        return "\n".join(lines)
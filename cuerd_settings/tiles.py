@@ -0,0 +1,148 @@
+from gi.repository import GLib, GObject, Gtk
+
+# Tamaño mínimo de cada botón; la FlowBox decide cuántos caben por fila
+TILE_WIDTH = 150
+TILE_HEIGHT = 40
+TILE_SPACING = 10
+
+# Elementos que se añaden al modelo por iteración del bucle principal
+FILL_CHUNK = 32
+
+# Botones libres que se conservan para reutilizarlos
+POOL_LIMIT = 64
+
+
+class EntryItem(GObject.Object):
+    """Elemento de un ``Gio.ListStore``: envuelve una entrada del catálogo"""
+
+    def __init__(self, entry):
+        super().__init__()
+        self.entry = entry
+
+
+class TilePool:
+    """Botones reutilizables para las FlowBox enlazadas a un modelo.
+
+    Una ``Gtk.FlowBox`` con ``bind_model`` destruye el hijo de cada elemento
+    que sale del modelo (al cambiar las entradas o vaciar una sección). El
+    botón se separa antes de esa destrucción y vuelve a la reserva, de modo
+    que reconstruir una sección solo cambia etiqueta, icono y estado.
+    """
+
+    def __init__(self, create, bind, unbind, limit=POOL_LIMIT):
+        self._create = create
+        self._bind = bind
+        self._unbind = unbind
+        self.limit = limit
+        self.free = []
+        self.bound = {}
+        self.created = 0
+
+    def acquire(self, item):
+        """Función ``create_widget_func`` de ``Gtk.FlowBox.bind_model``"""
+        if self.free:
+            button = self.free.pop()
+        else:
+            button = self._create()
+            button.connect("parent-set", self._on_parent_set)
+            self.created += 1
+        self.bound[button] = item.entry
+        self._bind(button, item.entry)
+        button.show_all()
+        return button
+
+    def entry(self, button):
+        return self.bound.get(button)
+
+    def _on_parent_set(self, button, old_parent):  # pylint: disable=unused-argument
+        parent = button.get_parent()
+        if isinstance(parent, Gtk.FlowBoxChild):
+            # El botón ya recibe el foco; el contenedor no necesita otra parada
+            parent.set_can_focus(False)
+            parent.connect("destroy", self._on_child_destroy, button)
+
+    def _on_child_destroy(self, child, button):
+        # Se ejecuta antes de que GTK destruya los hijos del contenedor
+        entry = self.bound.pop(button, None)
+        if entry is None:
+            return
+        child.remove(button)
+        self._unbind(button, entry)
+        if len(self.free) < self.limit:
+            self.free.append(button)
+        else:
+            button.destroy()
+
+    def trim(self):
+        """Destruir los botones libres (la ventana lleva tiempo inactiva)"""
+        released = len(self.free)
+        while self.free:
+            self.free.pop().destroy()
+        return released
+
+    def stats(self):
+        return {"created": self.created, "bound": len(self.bound), "free": len(self.free)}
+
+
+class SectionModel:
+    """Modelo de una sección: sus entradas y la FlowBox que las muestra.
+
+    Una FlowBox enlazada a un modelo no admite ``set_filter_func``: la
+    búsqueda y las herramientas no instaladas se aplican con ``show``, que
+    solo añade o quita del modelo los tramos que cambian.
+    """
+
+    def __init__(self, store, entries):
+        self.store = store
+        self.items = [EntryItem(entry) for entry in entries]
+        self.shown = []
+        self.fill_id = None
+
+    def set_entries(self, entries):
+        """Cambiar las entradas conservando los elementos que no cambian"""
+        items = {item.entry["id"]: item for item in self.items}
+        self.items = [
+            items[entry["id"]] if entry["id"] in items and items[entry["id"]].entry == entry else EntryItem(entry)
+            for entry in entries
+        ]
+
+    def show(self, items):
+        """Mostrar items en el modelo cambiando solo los tramos distintos.
+
+        Un modelo vacío se llena por tramos si son muchos elementos.
+        """
+        if items == self.shown:
+            return
+        if self.fill_id is not None:
+            GLib.source_remove(self.fill_id)
+            self.fill_id = None
+            # Lo que el modelo contiene de verdad hasta ahora
+            self.shown = self.shown[:self.store.get_n_items()]
+        old, self.shown = self.shown, list(items)
+        if not old:
+            self.store.splice(0, self.store.get_n_items(), self.shown[:FILL_CHUNK])
+            if len(self.shown) > FILL_CHUNK:
+                self.fill_id = GLib.idle_add(self._fill)
+            return
+
+        import difflib
+
+        # Desde el final para que las posiciones de los tramos anteriores no cambien;
+        # los botones que siguen en el modelo no se destruyen
+        matcher = difflib.SequenceMatcher(None, old, self.shown, autojunk=False)
+        for tag, old_start, old_end, start, end in reversed(matcher.get_opcodes()):
+            if tag != "equal":
+                self.store.splice(old_start, old_end - old_start, self.shown[start:end])
+
+    def _fill(self):
+        start = self.store.get_n_items()
+        self.store.splice(start, 0, self.shown[start:start + FILL_CHUNK])
+        if self.store.get_n_items() < len(self.shown):
+            return True
+        self.fill_id = None
+        return False
+
+
+def columns_for_width(width):
+    """Botones por fila que caben en width píxeles"""
+    return max(1, (width + TILE_SPACING) // (TILE_WIDTH + TILE_SPACING))
@@ -0,0 +1,61 @@
+import os
+
+# Nombre de la carpeta de la aplicación dentro de los directorios XDG
+APP_DIR = "cuerd_settings"
+
+
+def _home_dir(env, default):
+    path = os.environ.get(env)
+    if path and os.path.isabs(path):
+        return path
+    return os.path.join(os.path.expanduser("~"), default)
+
+
+def cache_home():
+    return _home_dir("XDG_CACHE_HOME", ".cache")
+
+
+def config_home():
+    return _home_dir("XDG_CONFIG_HOME", ".config")
+
+
+def data_home():
+    return _home_dir("XDG_DATA_HOME", os.path.join(".local", "share"))
+
+
+def state_home():
+    return _home_dir("XDG_STATE_HOME", os.path.join(".local", "state"))
+
+
+def data_dirs():
+    """Directorios de datos en orden de prioridad (el del usuario primero)"""
+    dirs = os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share"
+    return [data_home()] + [d for d in dirs.split(":") if d]
+
+
+def config_dirs():
+    dirs = os.environ.get("XDG_CONFIG_DIRS") or "/etc/xdg"
+    return [config_home()] + [d for d in dirs.split(":") if d]
+
+
+def app_cache_file(name):
+    return os.path.join(cache_home(), APP_DIR, name)
+
+
+def write_atomic(path, data):
+    """Escribir en un temporal y renombrarlo para no dejar archivos a medias"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    mode = "wb" if isinstance(data, bytes) else "w"
+    try:
+        with open(tmp_path, mode) as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise